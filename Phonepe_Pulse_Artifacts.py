@@ -0,0 +1,222 @@
+# Importing required libraries
+import os
+import json
+import shutil
+import pandas as pd
+
+
+# ___*___*___*___*___*___ Artifact Store Settings ___*___*___*___*___*___ #
+
+# Columns the artifacts are partitioned by, hive-style: <root>/<name>/Year=2022/Quarter=1/part-0.parquet
+partitionColumns = ('Year', 'Quarter')
+
+# Arrow type of each partition column, used to read the partition values back typed
+partitionTypes = {'Year': 'int16', 'Quarter': 'int8'}
+
+# Schema metadata key recording the column order of an artifact, partition columns included
+columnsMetadataKey = b'pulse_columns'
+
+# Schema metadata key recording the categorical columns of an artifact, read back as categories
+categoriesMetadataKey = b'pulse_categories'
+
+
+# ___*___*___*___*___*___ Artifact Store ___*___*___*___*___*___ #
+
+def artifactPath(root, name):
+    """
+    Returns the folder of an artifact.
+
+    Args:
+    - root (str): The folder of the artifact store.
+    - name (str): The artifact name, e.g. a dataset name.
+    """
+    return os.path.join(root, name)
+
+
+def partitionPath(root, name, year, quarter):
+    """
+    Returns the folder of one (Year, Quarter) partition of an artifact.
+
+    Args:
+    - root (str): The folder of the artifact store.
+    - name (str): The artifact name.
+    - year (int): The partition year.
+    - quarter (int): The partition quarter.
+    """
+    return os.path.join(artifactPath(root, name), f"Year={int(year)}", f"Quarter={int(quarter)}")
+
+
+def writePartitionFile(folder, df, fileName='part-0.parquet', replace=True):
+    """
+    Writes the rows of one partition to a Parquet file, without the partition columns which are encoded in
+    the folder name. The file is written under a temporary name and then renamed, so readers never see it
+    half-written.
+
+    Args:
+    - folder (str): The partition folder.
+    - df (pandas.DataFrame): The rows of the partition, with typed columns.
+    - fileName (str): The name of the Parquet file.
+    - replace (bool): Whether the other files of the partition are removed.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.Table.from_pandas(df.drop(columns = list(partitionColumns)), preserve_index = False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[columnsMetadataKey] = json.dumps(list(df.columns)).encode()
+    metadata[categoriesMetadataKey] = json.dumps([
+        column for column in df.columns if isinstance(df[column].dtype, pd.CategoricalDtype)
+    ]).encode()
+
+    # Categorical columns get the same dictionary type whatever their number of categories, so that every file
+    # of an artifact has the same schema
+    schema = pa.schema([
+        field.with_type(pa.dictionary(pa.int32(), pa.string())) if pa.types.is_dictionary(field.type) else field
+        for field in table.schema
+    ], metadata = metadata)
+    table = table.cast(schema)
+
+    os.makedirs(folder, exist_ok = True)
+    temporaryPath = os.path.join(folder, fileName + '.tmp')
+    pq.write_table(table, temporaryPath)
+    os.replace(temporaryPath, os.path.join(folder, fileName))
+
+    if replace:
+        for otherFile in os.listdir(folder):
+            if otherFile != fileName:
+                os.remove(os.path.join(folder, otherFile))
+
+
+def writeArtifact(root, name, df):
+    """
+    Writes a whole artifact, one Parquet file per (Year, Quarter) partition. The artifact is built in a
+    temporary folder and swapped in, replacing any previous version.
+
+    Args:
+    - root (str): The folder of the artifact store.
+    - name (str): The artifact name.
+    - df (pandas.DataFrame): The rows of the artifact, with typed columns.
+
+    Returns:
+    - partitionCount (int): The number of partitions written.
+    """
+    finalPath = artifactPath(root, name)
+    temporaryPath = finalPath + '.tmp'
+    shutil.rmtree(temporaryPath, ignore_errors = True)
+    os.makedirs(temporaryPath)
+
+    partitionCount = 0
+    for (year, quarter), partition in df.groupby(list(partitionColumns), sort = True):
+        writePartitionFile(partitionPath(root, name + '.tmp', year, quarter), partition)
+        partitionCount += 1
+
+    # Swap the new version in, then drop the previous one
+    previousPath = finalPath + '.old'
+    shutil.rmtree(previousPath, ignore_errors = True)
+    if os.path.exists(finalPath):
+        os.replace(finalPath, previousPath)
+    os.replace(temporaryPath, finalPath)
+    shutil.rmtree(previousPath, ignore_errors = True)
+    return partitionCount
+
+
+def clearArtifact(root, name):
+    """
+    Removes every partition of an artifact, before it is written again chunk by chunk.
+
+    Args:
+    - root (str): The folder of the artifact store.
+    - name (str): The artifact name.
+    """
+    shutil.rmtree(artifactPath(root, name), ignore_errors = True)
+    os.makedirs(artifactPath(root, name))
+
+
+def appendArtifact(root, name, df, chunkIndex):
+    """
+    Adds a chunk of rows to an artifact, as one new file in each (Year, Quarter) partition it touches.
+
+    Args:
+    - root (str): The folder of the artifact store.
+    - name (str): The artifact name.
+    - df (pandas.DataFrame): The rows of the chunk, with typed columns.
+    - chunkIndex (int): The position of the chunk in the stream, which names its files.
+    """
+    for (year, quarter), partition in df.groupby(list(partitionColumns), sort = True):
+        writePartitionFile(partitionPath(root, name, year, quarter), partition, f"part-{chunkIndex}.parquet", replace = False)
+
+
+def replaceArtifactPartitions(root, name, deltaFrame, partitions):
+    """
+    Replaces the rows of some (State, Year, Quarter) partitions of an artifact. Only the (Year, Quarter)
+    folders holding a replaced partition are rewritten.
+
+    Args:
+    - root (str): The folder of the artifact store.
+    - name (str): The artifact name.
+    - deltaFrame (pandas.DataFrame): The new rows of the partitions, with typed columns.
+    - partitions (pandas.DataFrame): The replaced partitions, with 'State', 'Year' and 'Quarter' columns.
+
+    Returns:
+    - partitionCount (int): The number of (Year, Quarter) folders rewritten.
+    """
+    replacedStates = partitions.groupby([partitions['Year'].astype(int), partitions['Quarter'].astype(int)])['State']
+    partitionCount = 0
+    for (year, quarter), states in replacedStates:
+        folder = partitionPath(root, name, year, quarter)
+        newRows = deltaFrame[(deltaFrame['Year'] == year) & (deltaFrame['Quarter'] == quarter)]
+        if os.path.exists(folder):
+            existing = readArtifact(root, name, {'Year': year, 'Quarter': quarter})
+            newRows = pd.concat([existing[~existing['State'].isin(set(states))], newRows], ignore_index = True)
+
+            # Concatenating categories that differ on each side gives plain strings, which are encoded again
+            newRows = newRows.astype({
+                column: 'category' for column in existing.columns if isinstance(existing[column].dtype, pd.CategoricalDtype)
+            })
+        writePartitionFile(folder, newRows)
+        partitionCount += 1
+    return partitionCount
+
+
+def readArtifact(root, name, filters=None, columns=None):
+    """
+    Reads an artifact with its typed columns. Filters on the partition columns prune whole folders, so only
+    the matching partitions are opened; filters on other columns are pushed down to the Parquet reader.
+
+    Args:
+    - root (str): The folder of the artifact store.
+    - name (str): The artifact name.
+    - filters (dict): The value, or list of values, required for each filtered column. Defaults to no filter.
+    - columns (list of str): The columns to read. Defaults to every column, in their original order.
+
+    Returns:
+    - df (pandas.DataFrame): The matching rows.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    partitioning = ds.partitioning(
+        pa.schema([(column, getattr(pa, partitionTypes[column])()) for column in partitionColumns]),
+        flavor = 'hive'
+    )
+    dataset = ds.dataset(artifactPath(root, name), format = 'parquet', partitioning = partitioning)
+    metadata = dataset.schema.metadata or {}
+    if metadata.get(categoriesMetadataKey):
+        # Read the categorical columns straight from their Parquet dictionaries
+        fileFormat = ds.ParquetFileFormat(
+            read_options = ds.ParquetReadOptions(dictionary_columns = json.loads(metadata[categoriesMetadataKey]))
+        )
+        dataset = ds.dataset(artifactPath(root, name), format = fileFormat, partitioning = partitioning)
+
+    expression = None
+    for column, value in (filters or {}).items():
+        if isinstance(value, (list, tuple, set)):
+            condition = ds.field(column).isin(list(value))
+        else:
+            condition = ds.field(column) == value
+        expression = condition if expression is None else expression & condition
+
+    df = dataset.to_table(columns = columns, filter = expression).to_pandas()
+    if columns is None and columnsMetadataKey in metadata:
+        df = df[json.loads(metadata[columnsMetadataKey])]
+    return df
@@ -0,0 +1,418 @@
+# Importing required libraries
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import platform
+import argparse
+import tempfile
+import contextlib
+from Phonepe_Pulse_DataExtraction import (
+    datasetSpecs, wideSpecs, extractionWorkers, extractionMode, sourceDatasets, sourceLabel, stateRows, extractDatasets,
+    builtWideTables, extractStage, exportStage, iterStateFiles
+)
+import Phonepe_Pulse_Database as pulseDatabase
+from Phonepe_Pulse_Sources import openSource
+from Phonepe_Pulse_QueryPlans import explorerQueries
+from Phonepe_Pulse_Artifacts import readArtifact
+from Phonepe_Pulse_Metrics import peakRss
+
+
+# ___*___*___*___*___*___ Benchmark Settings ___*___*___*___*___*___ #
+
+# State folder names of the Pulse data, used in this order by the synthetic tree
+pulseStates = [
+    'andaman-&-nicobar-islands', 'andhra-pradesh', 'arunachal-pradesh', 'assam', 'bihar', 'chandigarh', 'chhattisgarh',
+    'dadra-&-nagar-haveli-&-daman-&-diu', 'delhi', 'goa', 'gujarat', 'haryana', 'himachal-pradesh', 'jammu-&-kashmir',
+    'jharkhand', 'karnataka', 'kerala', 'ladakh', 'lakshadweep', 'madhya-pradesh', 'maharashtra', 'manipur', 'meghalaya',
+    'mizoram', 'nagaland', 'odisha', 'puducherry', 'punjab', 'rajasthan', 'sikkim', 'tamil-nadu', 'telangana', 'tripura',
+    'uttar-pradesh', 'uttarakhand', 'west-bengal',
+]
+
+# Transaction types and device brands found in the aggregated files
+transactionTypes = ['Recharge & bill payments', 'Peer-to-peer payments', 'Merchant payments', 'Financial Services', 'Others']
+deviceBrands = ['Xiaomi', 'Samsung', 'Vivo', 'Oppo', 'OnePlus', 'Realme', 'Apple', 'Motorola', 'Lenovo', 'Huawei', 'Others']
+
+# A stage is reported as a regression when its rate falls below this fraction of the baseline rate
+regressionTolerance = 0.2
+
+
+# ___*___*___*___*___*___ Synthetic Pulse Data ___*___*___*___*___*___ #
+
+def stateNames(stateCount):
+    """
+    Returns the state folder names of the synthetic tree: the real ones first, then made-up ones.
+
+    Args:
+    - stateCount (int): The number of states.
+    """
+    return pulseStates[:stateCount] + [f"state-{index + 1}" for index in range(len(pulseStates), stateCount)]
+
+
+def pulseDocument(source, randomizer, year, quarter, districts, pincodes):
+    """
+    Builds one synthetic JSON file of a Pulse subtree, with the same layout as the files of the Pulse repository.
+
+    Args:
+    - source (tuple): The subtree, as the 'source' of its datasets in 'datasetSpecs'.
+    - randomizer (random.Random): The source of the metric values.
+    - year (int): The year of the file.
+    - quarter (int): The quarter of the file.
+    - districts (list of str): The district names of the state, or of India.
+    - pincodes (list of str): The pincodes of the state, or of India.
+
+    Returns:
+    - document (dict): The JSON file content.
+    """
+    def metric(scale):
+        count = randomizer.randint(1, scale)
+        return {'type': 'TOTAL', 'count': count, 'amount': round(count * randomizer.uniform(50, 2000), 2)}
+
+    section = source[:2]
+    if section == ('aggregated', 'transaction'):
+        data = {
+            'from': 0, 'to': 0,
+            'transactionData': [{'name': name, 'paymentInstruments': [metric(10 ** 8)]} for name in transactionTypes],
+        }
+    elif section == ('aggregated', 'user'):
+        counts = [randomizer.randint(1, 10 ** 7) for brand in deviceBrands]
+        data = {
+            'aggregated': {'registeredUsers': sum(counts), 'appOpens': randomizer.randint(0, 10 ** 9)},
+            'usersByDevice': [
+                {'brand': brand, 'count': count, 'percentage': count / sum(counts)} for brand, count in zip(deviceBrands, counts)
+            ],
+        }
+    elif section == ('map', 'transaction'):
+        data = {'hoverDataList': [{'name': f"{district} district", 'metric': [metric(10 ** 7)]} for district in districts]}
+    elif section == ('map', 'user'):
+        data = {'hoverData': {
+            f"{district} district": {'registeredUsers': randomizer.randint(1, 10 ** 7), 'appOpens': randomizer.randint(0, 10 ** 9)}
+            for district in districts
+        }}
+    elif section == ('top', 'transaction'):
+        data = {
+            'states': None,
+            'districts': [{'entityName': district, 'metric': metric(10 ** 7)} for district in districts[:10]],
+            'pincodes': [{'entityName': pincode, 'metric': metric(10 ** 6)} for pincode in pincodes],
+        }
+    else:
+        data = {
+            'states': None,
+            'districts': [{'name': district, 'registeredUsers': randomizer.randint(1, 10 ** 7)} for district in districts[:10]],
+            'pincodes': [{'name': pincode, 'registeredUsers': randomizer.randint(1, 10 ** 6)} for pincode in pincodes],
+        }
+    return {'success': True, 'code': 'SUCCESS', 'data': data, 'responseTimestamp': int(time.mktime((year, quarter * 3, 1, 0, 0, 0, 0, 0, -1)) * 1000)}
+
+
+def generatePulseTree(dataRoot, stateCount=36, yearCount=5, districtCount=20, pincodeCount=10, seed=0):
+    """
+    Writes a synthetic Pulse 'data' folder: one <state>/<year>/<quarter>.json file per subtree, state, year
+    and quarter, from 2018 onwards, and one india/<year>/<quarter>.json file per India-wide subtree, year and quarter.
+
+    Args:
+    - dataRoot (str): The 'data' folder to create.
+    - stateCount (int): The number of states.
+    - yearCount (int): The number of years.
+    - districtCount (int): The number of districts per state, in the map files.
+    - pincodeCount (int): The number of pincodes per state, in the top files.
+    - seed (int): The seed of the metric values, so that a scale always gives the same tree.
+
+    Returns:
+    - fileCount (int): The number of files written.
+    """
+    randomizer = random.Random(seed)
+    # Several datasets read the same files (e.g. the pincodes and the districts of the top files)
+    sources = {spec['source']: spec.get('level', 'state') for spec in datasetSpecs.values()}
+    folders = []
+    countryDistricts, countryPincodes = [], []
+    for stateIndex, state in enumerate(stateNames(stateCount)):
+        districts = [f"{state.replace('-', ' ')} {index + 1}" for index in range(districtCount)]
+        pincodes = [str(100000 + stateIndex * 10000 + index) for index in range(pincodeCount)]
+        folders += [(source, state, districts, pincodes) for source, level in sources.items() if level == 'state']
+        # The India-wide top lists pick from the first district and pincode of every state
+        countryDistricts += districts[:1]
+        countryPincodes += pincodes[:1]
+    folders += [(source, 'india', countryDistricts, countryPincodes) for source, level in sources.items() if level == 'country']
+
+    fileCount = 0
+    for source, state, districts, pincodes in folders:
+        for year in range(2018, 2018 + yearCount):
+            yearPath = os.path.join(dataRoot, *source, state, str(year))
+            os.makedirs(yearPath, exist_ok = True)
+            for quarter in range(1, 5):
+                document = pulseDocument(source, randomizer, year, quarter, districts, pincodes)
+                with open(os.path.join(yearPath, f"{quarter}.json"), 'w') as fileHandle:
+                    json.dump(document, fileHandle)
+                fileCount += 1
+    return fileCount
+
+
+# ___*___*___*___*___*___ Benchmark ___*___*___*___*___*___ #
+
+def stageResult(stage, name, seconds, files=None, rows=None):
+    """
+    Builds the measurement of one timed stage.
+
+    Args:
+    - stage (str): The stage name.
+    - name (str): The dataset, table or 'all' the stage ran on.
+    - seconds (float): The wall time of the stage.
+    - files (int): The number of JSON files read, if any.
+    - rows (int): The number of rows produced, if any.
+
+    Returns:
+    - result (dict): The stage, name, seconds, files, rows, rates and peak memory so far.
+    """
+    selfPeak, childrenPeak = peakRss(), peakRss(children = True)
+    result = {
+        'stage': stage,
+        'name': name,
+        'seconds': round(seconds, 4),
+        'files': files,
+        'rows': rows,
+        'filesPerSecond': round(files / seconds, 1) if files and seconds > 0 else None,
+        'rowsPerSecond': round(rows / seconds, 1) if rows and seconds > 0 else None,
+        'peakRssMB': selfPeak,
+        'peakWorkerRssMB': childrenPeak,
+    }
+    counts = ''.join(
+        f", {count} {unit} ({result[unit + 'PerSecond']}/sec)" for unit, count in (('files', files), ('rows', rows)) if count is not None
+    )
+    print(f"{stage} {name}: {result['seconds']}s{counts}, peak RSS {selfPeak} MB")
+    return result
+
+
+def timed(function, *args, **kwargs):
+    """
+    Calls a function and returns its result with the wall time it took, in seconds.
+    """
+    startTime = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - startTime
+
+
+def serialStateRows(dataRoot, datasetNames):
+    """
+    Parses every file of a source serially and flattens it for each dataset read from it, one 'stateRows' work
+    unit per state.
+
+    Args:
+    - dataRoot (str or source): The Pulse data, as a path or a source (see 'openSource').
+    - datasetNames (list of str): The keys of the datasets in 'datasetSpecs' read from the source.
+
+    Returns:
+    - files (int): The number of JSON files listed.
+    - rows (int): The number of rows flattened.
+    """
+    source = openSource(dataRoot)
+    files = rows = 0
+    for state in source.listDir(datasetSpecs[datasetNames[0]]['source']):
+        unitRows, quarantined, unitMetrics = stateRows(source, dict.fromkeys(datasetNames), state)
+        files += unitMetrics[(sourceLabel(datasetNames), 'walk')]['files']
+        rows += sum(len(datasetRows) for datasetRows in unitRows.values())
+    return files, rows
+
+
+def fetchQuery(cursor, query):
+    """
+    Runs a query and returns all its rows.
+    """
+    cursor.execute(query)
+    return cursor.fetchall()
+
+
+def runBenchmark(dataRoot, workFolder, workers=None, mode=None, databaseUrl=None):
+    """
+    Times every stage of the pipeline on a Pulse 'data' folder: the serial 'stateRows' work units of each
+    source, 'extractDatasets' across the pool of workers, the extraction into the artifact store, the CSV export,
+    the full load of every table into the database, and the Explorer queries on it.
+
+    Args:
+    - dataRoot (str): The Pulse 'data' folder.
+    - workFolder (str): The folder the artifact store, the CSV files and the SQLite database are written to.
+    - workers (int): Number of extraction workers. Defaults to 'extractionWorkers'.
+    - mode (str): 'process', 'thread' or 'serial'. Defaults to 'extractionMode'.
+    - databaseUrl (str): The database to load. Defaults to an embedded SQLite database in the work folder.
+
+    Returns:
+    - results (list of dict): The measurement of each stage (see 'stageResult').
+    """
+    results = []
+    datasetNames = list(datasetSpecs)
+    sources = sourceDatasets(datasetNames)
+    for sourceNames in sources.values():
+        (files, rows), seconds = timed(serialStateRows, dataRoot, sourceNames)
+        results.append(stageResult('stateRows', sourceLabel(sourceNames), seconds, files = files, rows = rows))
+
+    # Every file is read once, however many datasets are read from it
+    totalFiles = sum(
+        len(list(iterStateFiles(dataRoot, datasetSpecs[sourceNames[0]], state)))
+        for source, sourceNames in sources.items() for state in os.listdir(os.path.join(dataRoot, *source))
+    )
+    extractedFrames, seconds = timed(extractDatasets, dataRoot, datasetNames, workers, mode)
+    results.append(stageResult('extractDatasets', 'all', seconds, files = totalFiles, rows = sum(len(df) for df in extractedFrames.values())))
+    del extractedFrames
+
+    artifactFolder = os.path.join(workFolder, 'Pulse_Artifacts')
+    unused, seconds = timed(extractStage, dataRoot, artifactFolder, datasetNames, workers = workers, mode = mode)
+    names = datasetNames + builtWideTables(artifactFolder, datasetNames)
+    frames = {name: readArtifact(artifactFolder, name) for name in names}
+    results.append(stageResult('extract', 'all', seconds, files = totalFiles, rows = sum(len(frames[name]) for name in datasetNames)))
+
+    unused, seconds = timed(exportStage, artifactFolder, workFolder, datasetNames)
+    results.append(stageResult('export', 'all', seconds, rows = sum(len(df) for df in frames.values())))
+
+    pulseDatabase.configureDatabase(databaseUrl or f"sqlite:///{os.path.join(workFolder, 'PhonePe_Pulse.db')}")
+    tableFrames = [((datasetSpecs[name] if name in datasetSpecs else wideSpecs[name])['table'], frames[name]) for name in names]
+    connection = pulseDatabase.connectToServer()
+    # The replaced tables are kept as the previous generations, as in any full refresh, so that a benchmark run
+    # against a real database can still be rolled back
+    loadStats, seconds = timed(pulseDatabase.fullLoad, connection, tableFrames)
+    connection.close()
+    for stats in loadStats:
+        results.append(stageResult('load', stats['table'], stats['seconds'], rows = stats['rows']))
+    # The whole load also builds the rollup tables and swaps the shadow database in
+    results.append(stageResult('load', 'all', seconds, rows = sum(stats['rows'] for stats in loadStats)))
+
+    connection = pulseDatabase.connectToServer(pulseDatabase.databaseName)
+    myCursor = connection.cursor()
+    for name, query in explorerQueries.items():
+        try:
+            rows, seconds = timed(fetchQuery, myCursor, query)
+        except Exception as e:
+            # e.g. the queries joining the pincode reference table, when it is not available
+            print(f"query {name}: skipped ({e})")
+            continue
+        results.append(stageResult('query', name, seconds, rows = len(rows)))
+    myCursor.close()
+    connection.close()
+    return results
+
+
+def findRegressions(results, baseline, tolerance=None):
+    """
+    Compares the rates of a benchmark run with those of a previous run of the same scale.
+
+    Args:
+    - results (list of dict): The measurements of this run.
+    - baseline (list of dict): The measurements of the previous run.
+    - tolerance (float): The allowed slowdown, as a fraction of the baseline rate. Defaults to 'regressionTolerance'.
+
+    Returns:
+    - regressions (list of str): One description per stage whose rate fell below the allowed slowdown.
+    """
+    tolerance = regressionTolerance if tolerance is None else tolerance
+    baselineRates = {(result['stage'], result['name']): result for result in baseline}
+    regressions = []
+    for result in results:
+        previous = baselineRates.get((result['stage'], result['name']))
+        if previous is None:
+            continue
+        rateKey = 'rowsPerSecond' if result['rowsPerSecond'] is not None else 'filesPerSecond'
+        if result[rateKey] is not None and previous[rateKey] and result[rateKey] < previous[rateKey] * (1 - tolerance):
+            regressions.append(f"{result['stage']} {result['name']}: {result[rateKey]} {rateKey} against {previous[rateKey]}")
+    return regressions
+
+
+def parseArguments(argv=None):
+    """
+    Parses the command line of the benchmark.
+
+    Args:
+    - argv (list of str): The command line arguments. Defaults to 'sys.argv'.
+
+    Returns:
+    - arguments (argparse.Namespace): The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description = 'Benchmarks the extraction, export and load of a synthetic Pulse data tree.')
+    parser.add_argument('--states', type = int, default = len(pulseStates), help = 'number of states in the synthetic tree')
+    parser.add_argument('--years', type = int, default = 5, help = 'number of years, from 2018 onwards')
+    parser.add_argument('--districts', type = int, default = 20, help = 'number of districts per state')
+    parser.add_argument('--pincodes', type = int, default = 10, help = 'number of pincodes per state')
+    parser.add_argument('--seed', type = int, default = 0, help = 'seed of the synthetic metric values')
+    parser.add_argument('--data-root', help = "benchmark this Pulse 'data' folder instead of generating one")
+    parser.add_argument('--work-dir', help = 'the folder the synthetic tree, artifacts and CSV files are written to (default: a temporary folder, removed afterwards)')
+    parser.add_argument('--workers', type = int, default = extractionWorkers, help = 'number of extraction workers')
+    parser.add_argument('--mode', choices = ('process', 'thread', 'serial'), default = extractionMode, help = 'kind of extraction pool')
+    parser.add_argument('--db-url', help = 'load this database instead of a SQLite database in the work folder; its Pulse tables are replaced, the previous ones kept for rollback')
+    parser.add_argument('--output', help = 'write the JSON report to this file instead of the standard output')
+    parser.add_argument('--baseline', help = 'a previous JSON report; exit with an error when a stage is slower than it')
+    parser.add_argument('--tolerance', type = float, default = regressionTolerance, help = 'allowed slowdown against the baseline, as a fraction')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Generates the synthetic tree, runs the benchmark and writes the JSON report.
+
+    Args:
+    - argv (list of str): The command line arguments. Defaults to 'sys.argv'.
+
+    Returns:
+    - status (int): 1 when a stage regressed against the baseline, 0 otherwise.
+    """
+    arguments = parseArguments(argv)
+    workFolder = arguments.work_dir or tempfile.mkdtemp(prefix = 'pulse-benchmark-')
+    os.makedirs(workFolder, exist_ok = True)
+
+    # Progress messages go to the standard error, so that the standard output only holds the report
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            dataRoot = arguments.data_root
+            generation = None
+            if dataRoot is None:
+                dataRoot = os.path.join(workFolder, 'data')
+                shutil.rmtree(dataRoot, ignore_errors = True)
+                fileCount, seconds = timed(
+                    generatePulseTree, dataRoot, arguments.states, arguments.years, arguments.districts, arguments.pincodes, arguments.seed
+                )
+                generation = {'files': fileCount, 'seconds': round(seconds, 3)}
+                print(f"Generated {fileCount} files in {generation['seconds']}s")
+            results = runBenchmark(dataRoot, workFolder, arguments.workers, arguments.mode, arguments.db_url)
+        finally:
+            if arguments.work_dir is None:
+                shutil.rmtree(workFolder, ignore_errors = True)
+
+    report = {
+        'scale': {
+            'dataRoot': arguments.data_root,
+            'states': arguments.states,
+            'years': arguments.years,
+            'districts': arguments.districts,
+            'pincodes': arguments.pincodes,
+            'seed': arguments.seed,
+        },
+        'generation': generation,
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'workers': arguments.workers,
+            'mode': arguments.mode,
+            'database': pulseDatabase.databaseBackend,
+        },
+        'results': results,
+    }
+
+    status = 0
+    if arguments.baseline:
+        with open(arguments.baseline) as fileHandle:
+            regressions = findRegressions(results, json.load(fileHandle)['results'], arguments.tolerance)
+        report['regressions'] = regressions
+        for regression in regressions:
+            print(f"Regression: {regression}", file = sys.stderr)
+        status = 1 if regressions else 0
+
+    if arguments.output:
+        with open(arguments.output, 'w') as fileHandle:
+            json.dump(report, fileHandle, indent = 2)
+    else:
+        json.dump(report, sys.stdout, indent = 2)
+        print()
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,163 @@
+# Importing required libraries
+import numpy as np
+import pandas as pd
+
+
+# ___*___*___*___*___*___ Explore Data Aggregate Cube ___*___*___*___*___*___ #
+
+class AggregateCube:
+    """
+    The Explore Data aggregates as dense NumPy arrays over state x year x quarter (x transaction type), with the
+    index of every dimension value. A panel view is then an array slice rather than a filter and group-by
+    over the tables. The cube is read-only once built, and is rebuilt from the tables after each refresh.
+    """
+
+    def __init__(self, transRows, userRows):
+        """
+        Builds the cube.
+
+        Args:
+        - transRows (list of tuple): The (State, Year, Quarter, Transaction_Type, Transaction_Count,
+          Transaction_Amount) rows of the aggregated transactions.
+        - userRows (list of tuple): The (State, Year, Quarter, User_Count, User_Percentage) rows of the
+          aggregated users, one per brand or already summed per quarter.
+        """
+        dfTrans = pd.DataFrame(transRows, columns = ['State', 'Year', 'Quarter', 'Type', 'Count', 'Amount'])
+        dfUser = pd.DataFrame(userRows, columns = ['State', 'Year', 'Quarter', 'Count', 'Percentage'])
+
+        # Dimension values and their index along each axis
+        self.states = sorted(set(dfTrans['State']) | set(dfUser['State']))
+        self.years = sorted({int(year) for year in set(dfTrans['Year']) | set(dfUser['Year'])})
+        self.quarters = [1, 2, 3, 4]
+        self.types = sorted(set(dfTrans['Type']))
+        self.stateIndex = {state: index for index, state in enumerate(self.states)}
+        self.yearIndex = {year: index for index, year in enumerate(self.years)}
+        self.typeIndex = {transactionType: index for index, transactionType in enumerate(self.types)}
+
+        shape = (len(self.states), len(self.years), len(self.quarters))
+        transCells = self.cells(dfTrans) + (dfTrans['Type'].map(self.typeIndex).to_numpy(),)
+        self.transCount = np.zeros(shape + (len(self.types),), dtype = np.int64)
+        self.transAmount = np.zeros(shape + (len(self.types),))
+        self.transPresent = np.zeros(shape + (len(self.types),), dtype = bool)
+        np.add.at(self.transCount, transCells, dfTrans['Count'].fillna(0).to_numpy(dtype = np.int64))
+        np.add.at(self.transAmount, transCells, dfTrans['Amount'].fillna(0).to_numpy(dtype = np.float64))
+        self.transPresent[transCells] = True
+
+        userCells = self.cells(dfUser)
+        self.userCount = np.zeros(shape, dtype = np.int64)
+        self.userPercentage = np.zeros(shape)
+        self.userPresent = np.zeros(shape, dtype = bool)
+        np.add.at(self.userCount, userCells, dfUser['Count'].fillna(0).to_numpy(dtype = np.int64))
+        np.add.at(self.userPercentage, userCells, dfUser['Percentage'].fillna(0).to_numpy(dtype = np.float64))
+        self.userPresent[userCells] = True
+
+    def cells(self, df):
+        """
+        Returns the (state, year, quarter) array indexes of the rows of a table.
+        """
+        return (
+            df['State'].map(self.stateIndex).to_numpy(),
+            df['Year'].astype(int).map(self.yearIndex).to_numpy(),
+            df['Quarter'].astype(int).to_numpy() - 1,
+        )
+
+    def stateSlice(self, State):
+        """
+        Returns the state axis index of a state, a slice of every state for 'All', or None for an unknown state.
+        """
+        if State == 'All':
+            return slice(None)
+        return self.stateIndex.get(State)
+
+    def transactionTypes(self, Year, Quarter, State):
+        """
+        Returns the transaction amount of each transaction type in a quarter, summed over the selected states.
+
+        Args:
+        - Year (int): The year.
+        - Quarter (int): The quarter.
+        - State (str): The state, or 'All'.
+
+        Returns:
+        - df (pandas.DataFrame): The 'Transaction Type' and 'Transaction Amount', by decreasing amount.
+        """
+        stateAxis = self.stateSlice(State)
+        columns = ['Transaction Type', 'Transaction Amount']
+        if stateAxis is None or Year not in self.yearIndex:
+            return pd.DataFrame(columns = columns)
+        cell = (stateAxis, self.yearIndex[Year], Quarter - 1)
+        amounts, present = self.transAmount[cell], self.transPresent[cell]
+        if State == 'All':
+            amounts, present = amounts.sum(axis = 0), present.any(axis = 0)
+        order = [index for index in np.argsort(-amounts, kind = 'stable') if present[index]]
+        return pd.DataFrame({'Transaction Type': [self.types[index] for index in order], 'Transaction Amount': amounts[order]}, columns = columns)
+
+    def registeredUsers(self, Year, Quarter, State):
+        """
+        Returns the registered users of a quarter, summed over the selected states.
+        """
+        stateAxis = self.stateSlice(State)
+        if stateAxis is None or Year not in self.yearIndex:
+            return 0
+        return int(self.userCount[stateAxis, self.yearIndex[Year], Quarter - 1].sum())
+
+    def stateMap(self, analyser, Year, Quarter, State):
+        """
+        Returns the per-state figures shown on the map of a quarter.
+
+        Args:
+        - analyser (str): 'Transactions' or 'Users'.
+        - Year (int): The year.
+        - Quarter (int): The quarter.
+        - State (str): The state, or 'All'.
+
+        Returns:
+        - df (pandas.DataFrame): One row per state with data: the average amount per transaction type, the total
+          amount and the total count of the transactions, or the user count and the sum of the brand percentages.
+        """
+        if analyser == "Transactions":
+            columns = ['State', 'Avg_transaction_amount', 'Total_transaction_amount', 'Total_transaction_count']
+        else:
+            columns = ['State', 'User Count', 'User Percentage']
+        stateAxis = self.stateSlice(State)
+        if stateAxis is None or Year not in self.yearIndex:
+            return pd.DataFrame(columns = columns)
+        yearAxis, quarterAxis = self.yearIndex[Year], Quarter - 1
+        states = np.array(self.states, dtype = object)[stateAxis]
+
+        if analyser == "Transactions":
+            present = np.atleast_2d(self.transPresent[stateAxis, yearAxis, quarterAxis])
+            amounts = np.atleast_2d(self.transAmount[stateAxis, yearAxis, quarterAxis]).sum(axis = 1)
+            counts = np.atleast_2d(self.transCount[stateAxis, yearAxis, quarterAxis]).sum(axis = 1)
+            typeCounts = present.sum(axis = 1)
+            rows = typeCounts > 0
+            return pd.DataFrame({
+                'State': np.atleast_1d(states)[rows],
+                'Avg_transaction_amount': amounts[rows] / typeCounts[rows],
+                'Total_transaction_amount': amounts[rows],
+                'Total_transaction_count': counts[rows],
+            }, columns = columns)
+
+        rows = np.atleast_1d(self.userPresent[stateAxis, yearAxis, quarterAxis])
+        return pd.DataFrame({
+            'State': np.atleast_1d(states)[rows],
+            'User Count': np.atleast_1d(self.userCount[stateAxis, yearAxis, quarterAxis])[rows],
+            'User Percentage': np.atleast_1d(self.userPercentage[stateAxis, yearAxis, quarterAxis])[rows],
+        }, columns = columns)
+
+
+def loadAggregateCube(cursor):
+    """
+    Builds the aggregate cube from the Pulse tables.
+
+    Args:
+    - cursor (object): MySQL or SQLite cursor object, on the Pulse database.
+
+    Returns:
+    - cube (AggregateCube): The cube.
+    """
+    cursor.execute("SELECT State, Year, Quarter, Transaction_Type, Transaction_Count, Transaction_Amount FROM aggtrans")
+    transRows = cursor.fetchall()
+    cursor.execute("SELECT State, Year, Quarter, SUM(User_Count), SUM(User_Percentage) FROM agguser GROUP BY State, Year, Quarter")
+    userRows = cursor.fetchall()
+    return AggregateCube(transRows, userRows)
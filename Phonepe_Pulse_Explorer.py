@@ -1,12 +1,13 @@
 # Importing required libraries
 import streamlit as st
 from streamlit_option_menu import option_menu
-import mysql.connector as mySql
 import pandas as pd
-import requests 
 import plotly.express as px
 import locale
 import plotly.graph_objects as go
+from Phonepe_Pulse_Database import ConnectionPool, databaseName, parameterMarker
+from Phonepe_Pulse_GeoJson import loadStatesGeoJson
+from Phonepe_Pulse_Cube import loadAggregateCube
 
 
 # ___*___*___*___*___*___ Format Numbers In Indian Style ___*___*___*___*___*___ #
@@ -23,69 +24,199 @@ def indianNumberFormat(number):
     return formattedNumber
 
 
-# ___*___*___*___*___*___ Establish connection to MySQL database ___*___*___*___*___*___ #
-def connectToMySql():
+# ___*___*___*___*___*___ Establish connection to the Pulse database ___*___*___*___*___*___ #
+@st.cache_resource
+def connectionPool():
     """
-    Establish connection to MySQL database.
+    Create the pool of connections to the Pulse database, shared by every session of the Streamlit server.
+    Its size and timeouts are set by PULSE_POOL_SIZE, PULSE_POOL_TIMEOUT and PULSE_POOL_PING_INTERVAL.
     Returns:
-        object: MySQL connection object.
+        ConnectionPool: Pool of MySQL or SQLite connections.
     """
-    myConnection = mySql.connect(
-        host = 'localhost',
-        user = 'root',
-        password = 'root',
-        database = 'phonepe_pulse'
-    )
+    return ConnectionPool(databaseName)
+
+
+def connectToDatabase():
+    """
+    Check out a connection to the Pulse database, on the MySQL server or in the SQLite database file
+    configured in Phonepe_Pulse_Database (e.g. through PULSE_DB_URL). Closing it returns it to the pool.
+    Returns:
+        object: Pooled MySQL or SQLite connection object.
+    """
+    myConnection = connectionPool().connection()
     return myConnection
 
-    
-# ___*___*___*___*___*___ Load data from MySQL tables into Pandas DataFrames ___*___*___*___*___*___ #
-def dataFrameLoader():
+
+# ___*___*___*___*___*___ Identify the data loaded in the database ___*___*___*___*___*___ #
+def currentRefresh():
     """
-    Load data from MySQL tables into Pandas DataFrames.
+    Read the last refresh of the Pulse database, which changes whenever the loader refreshes the data or
+    rolls it back.
     Returns:
-        tuple: DataFrames containing data from MySQL tables.
+        tuple: Refresh date and id (only the date for a database loaded before refresh ids were recorded).
     """
-    mySqlConnection = connectToMySql()
+    mySqlConnection = connectToDatabase()
     myCursor = mySqlConnection.cursor()
+    myCursor.execute("SELECT * FROM lastrefreshed")
+    refresh = tuple(myCursor.fetchone() or ())
+    myCursor.close()
+    mySqlConnection.close()
+    return refresh
 
-    # Query to retreive Aggregated Transaction data
-    myCursor.execute('SELECT * FROM aggtrans')
-    aggTransTable = myCursor.fetchall()
-    df_aggTrans = pd.DataFrame(aggTransTable,columns = ['State','Year','Quarter','Transaction Type','Transaction Count', 'Transaction Amount'])
-        
-    # Query to retreive Aggregated User data
-    myCursor.execute('SELECT * FROM agguser')
-    aggUserTable = myCursor.fetchall()
-    df_aggUser = pd.DataFrame(aggUserTable, columns = ['State', 'Year', 'Quarter', 'Brand Name', 'User Count', 'User Percentage'])
-    
-    # Query to retreive Map Transaction data
-    myCursor.execute('SELECT * FROM maptrans')
-    mapTransTable = myCursor.fetchall()
-    df_mapTrans = pd.DataFrame(mapTransTable, columns = ['State', 'Year', 'Quarter', 'District', 'Transaction Count', 'Transaction Amount'])
-    
-    # Query to retreive Map User data
-    myCursor.execute('SELECT * FROM mapuser')
-    mapUserTable = myCursor.fetchall()
-    df_mapUser = pd.DataFrame(mapUserTable, columns = ['State', 'Year', 'Quarter', 'District', 'Registered Users', 'App Opens'])
-    
-    # Query to retreive Top Transaction data
-    myCursor.execute('SELECT * FROM toptrans')
-    topTransTable = myCursor.fetchall()
-    df_topTrans = pd.DataFrame(topTransTable, columns = ['State', 'Year', 'Quarter', 'Pincode', 'Transaction Count', 'Transaction Amount'])
-    df_topTrans['Pincode'] = df_topTrans['Pincode'].astype(str)
-
-    # Querty to retreive Top User data
-    myCursor.execute('SELECT * FROM topuser')
-    topUserTable = myCursor.fetchall()
-    df_topUser = pd.DataFrame(topUserTable, columns = ['State', 'Year', 'Quarter', 'Pincode', 'Registered Users'])
-    df_topUser['Pincode'] = df_topUser['Pincode'].astype(str)
-    
+
+# ___*___*___*___*___*___ Query the Explore Data panels ___*___*___*___*___*___ #
+@st.cache_data(max_entries = 1000, show_spinner = False)
+def exploreQuery(refresh, query, parameters, columns):
+    """
+    Run a query of the Explore Data page, which filters and aggregates in the database and returns only the
+    rows a panel displays. Results are shared by every session until the next refresh of the database.
+    Args:
+        refresh (tuple): Last refresh of the database (see currentRefresh), only used as the cache key.
+        query (str): SQL query, with a parameter marker for each parameter.
+        parameters (tuple): Query parameters.
+        columns (list): Column names of the result.
+    Returns:
+        pandas.DataFrame: Query result.
+    """
+    mySqlConnection = connectToDatabase()
+    myCursor = mySqlConnection.cursor()
+    myCursor.execute(query, parameters)
+    df = pd.DataFrame(myCursor.fetchall(), columns = columns)
+    myCursor.close()
     mySqlConnection.close()
+    return df
+
+
+@st.cache_resource(max_entries = 1, show_spinner = False)
+def aggregateCube(refresh):
+    """
+    Build the aggregate cube of the transactions and users of every state, year and quarter, once per refresh
+    of the database. It is shared by every session, which must not modify it.
+    Args:
+        refresh (tuple): Last refresh of the database (see currentRefresh), only used as the cache key.
+    Returns:
+        AggregateCube: Aggregates as NumPy arrays (see Phonepe_Pulse_Cube).
+    """
+    mySqlConnection = connectToDatabase()
+    myCursor = mySqlConnection.cursor()
+    cube = loadAggregateCube(myCursor)
     myCursor.close()
+    mySqlConnection.close()
+    return cube
 
-    return df_aggTrans, df_aggUser, df_mapTrans, df_mapUser, df_topTrans, df_topUser
 
+def stateCondition(State, marker):
+    """
+    Build the State filter of an Explore Data query.
+    Args:
+        State (str): Selected state, or 'All'.
+        marker (str): Parameter marker of the database.
+    Returns:
+        tuple: SQL condition (empty for 'All') and its parameters.
+    """
+    if State == 'All':
+        return "", ()
+    return f" AND State = {marker}", (State,)
+
+
+def exploreTransactions(refresh, Year, qtr, State):
+    """
+    Query the Transactions panel of a year, quarter and state.
+    Args:
+        refresh (tuple): Last refresh of the database (see currentRefresh).
+        Year (int): Selected year.
+        qtr (int): Selected quarter.
+        State (str): Selected state, or 'All' for India.
+    Returns:
+        tuple: Transaction types, top 10 districts and top 10 pincodes, sorted by transaction amount.
+    """
+    marker = parameterMarker()
+    condition, stateParameters = stateCondition(State, marker)
+    if State == 'All':
+        # The India-wide totals and top districts are published by PhonePe, so they are looked up
+        # rather than summed over every state and district
+        dfTypes = exploreQuery(refresh, f"""
+            SELECT Transaction_Type, Transaction_Amount FROM countrytrans
+            WHERE State = 'India' AND Year = {marker} AND Quarter = {marker}
+            ORDER BY Transaction_Amount DESC""", (Year, qtr), ['Transaction Type', 'Transaction Amount'])
+        districtTable = 'countrytopdistricttrans'
+        districtParameters = ('India',)
+    else:
+        dfTypes = aggregateCube(refresh).transactionTypes(Year, qtr, State)
+        districtTable = 'topdistricttrans'
+        districtParameters = (State,)
+    dfDistricts = exploreQuery(refresh, f"""
+        SELECT District, Transaction_Amount FROM {districtTable}
+        WHERE State = {marker} AND Year = {marker} AND Quarter = {marker}
+        ORDER BY Transaction_Amount DESC LIMIT 10""", districtParameters + (Year, qtr), ['District', 'Transaction Amount'])
+    dfPincodes = exploreQuery(refresh, f"""
+        SELECT Pincode, SUM(Transaction_Amount) AS Transaction_Amount FROM toptrans
+        WHERE Year = {marker} AND Quarter = {marker}{condition}
+        GROUP BY Pincode ORDER BY Transaction_Amount DESC LIMIT 10""", (Year, qtr) + stateParameters, ['Pincode', 'Transaction Amount'])
+    dfPincodes['Pincode'] = dfPincodes['Pincode'].astype(str)
+    return dfTypes, dfDistricts, dfPincodes
+
+
+def exploreUsers(refresh, Year, qtr, State):
+    """
+    Query the Users panel of a year, quarter and state.
+    Args:
+        refresh (tuple): Last refresh of the database (see currentRefresh).
+        Year (int): Selected year.
+        qtr (int): Selected quarter.
+        State (str): Selected state, or 'All' for India.
+    Returns:
+        tuple: Registered users, top 10 districts and top 10 pincodes, sorted by registered users.
+    """
+    marker = parameterMarker()
+    condition, stateParameters = stateCondition(State, marker)
+    if State == 'All':
+        dfUsers = exploreQuery(refresh, f"""
+            SELECT RegisteredUsers FROM countryuser
+            WHERE State = 'India' AND Year = {marker} AND Quarter = {marker}""", (Year, qtr), ['User Count'])
+        districtTable = 'countrytopdistrictuser'
+        districtParameters = ('India',)
+    else:
+        dfUsers = pd.DataFrame({'User Count': [aggregateCube(refresh).registeredUsers(Year, qtr, State)]})
+        districtTable = 'topdistrictuser'
+        districtParameters = (State,)
+    dfDistricts = exploreQuery(refresh, f"""
+        SELECT District, RegisteredUsers FROM {districtTable}
+        WHERE State = {marker} AND Year = {marker} AND Quarter = {marker}
+        ORDER BY RegisteredUsers DESC LIMIT 10""", districtParameters + (Year, qtr), ['District', 'Registered Users'])
+    dfPincodes = exploreQuery(refresh, f"""
+        SELECT Pincode, SUM(Registered_User) AS Registered_User FROM topuser
+        WHERE Year = {marker} AND Quarter = {marker}{condition}
+        GROUP BY Pincode ORDER BY Registered_User DESC LIMIT 10""", (Year, qtr) + stateParameters, ['Pincode', 'Registered Users'])
+    dfPincodes['Pincode'] = dfPincodes['Pincode'].astype(str)
+    return dfUsers, dfDistricts, dfPincodes
+
+
+def exploreMap(refresh, analyser, Year, qtr, State):
+    """
+    Slice the per-state figures shown on the map of a year, quarter and state out of the aggregate cube.
+    Args:
+        refresh (tuple): Last refresh of the database (see currentRefresh).
+        analyser (str): 'Transactions' or 'Users'.
+        Year (int): Selected year.
+        qtr (int): Selected quarter.
+        State (str): Selected state, or 'All' for every state.
+    Returns:
+        pandas.DataFrame: One row per state.
+    """
+    return aggregateCube(refresh).stateMap(analyser, Year, qtr, State)
+
+
+# ___*___*___*___*___*___ Load the map of the Indian states ___*___*___*___*___*___ #
+@st.cache_resource
+def indiaStatesGeoJson():
+    """
+    Load the simplified GeoJSON of the Indian states once per server process. It is only downloaded the first
+    time, then read from the local cache (see Phonepe_Pulse_GeoJson).
+    Returns:
+        dict: GeoJSON feature collection of the states.
+    """
+    return loadStatesGeoJson()
 
 
 # ___*___*___*___*___*___ Setting up the page configuration ___*___*___*___*___*___ #
@@ -231,20 +362,16 @@ if selected == "Analysis":
     st.write("")
     st.write("")
     st.write("")
-    mySqlConnection = connectToMySql()
+    mySqlConnection = connectToDatabase()
     myCursor = mySqlConnection.cursor()
-    myCursor.execute("""select concat(t.month,', ',t.year) as maxmonth from (select year, quarter, 
-                    CASE
-                    WHEN quarter = 1 then 'March'
-                    WHEN quarter = 2 then 'June'
-                    WHEN quarter = 3 then 'September'
-                    else 'December'
-                    end as 'month'
-                    from aggTrans order by year desc, quarter desc LIMIT 1) as t;""")
-    dataAvailableTill = myCursor.fetchone()[0]
+    myCursor.execute("select year, quarter from aggTrans order by year desc, quarter desc LIMIT 1")
+    latestYear, latestQuarter = myCursor.fetchone()
+    quarterMonths = {1: 'March', 2: 'June', 3: 'September', 4: 'December'}
+    dataAvailableTill = f"{quarterMonths[latestQuarter]}, {latestYear}"
     myCursor.execute("SELECT * FROM lastrefreshed")
     lastRefreshedOn = myCursor.fetchone()[0]
-    lastRefreshedOn = lastRefreshedOn.strftime("%d-%m-%Y")
+    # MySQL returns a date, SQLite the ISO date string
+    lastRefreshedOn = pd.Timestamp(lastRefreshedOn).strftime("%d-%m-%Y")
     col1,col2 = st.columns([11,3], gap="large")
     with col1:
         st.header(":violet[Analyse Phonepe pulse data]")
@@ -280,9 +407,8 @@ if selected == "Analysis":
         
         if selected_year == "All":
             myCursor.execute('''
-                SELECT State, Year, SUM(Transaction_amount) AS Transaction_amount
-                from aggtrans 
-                GROUP BY State, Year
+                SELECT State, Year, Transaction_amount
+                from RollupStateYear
                 ORDER BY Transaction_amount DESC
                 LIMIT 10'''
             )
@@ -323,9 +449,8 @@ if selected == "Analysis":
 
         else:
             myCursor.execute(f'''
-                SELECT State, Year, SUM(Transaction_amount) AS Transaction_amount
-                from aggtrans WHERE Year = {int(selected_year)}
-                GROUP BY State, Year
+                SELECT State, Year, Transaction_amount
+                from RollupStateYear WHERE Year = {int(selected_year)}
                 ORDER BY Transaction_amount DESC
                 LIMIT 10'''
             )
@@ -372,13 +497,10 @@ if selected == "Analysis":
         with col2:
             st.write("")
 
-        mySqlConnection = connectToMySql()
-        myCursor = mySqlConnection.cursor()
         if selected_year == "All":
             myCursor.execute('''
-                SELECT State, Year, SUM(Transaction_amount) AS Transaction_amount
-                from aggtrans 
-                GROUP BY State, Year
+                SELECT State, Year, Transaction_amount
+                from RollupStateYear
                 ORDER BY Transaction_amount ASC
                 LIMIT 10'''
             )
@@ -405,9 +527,8 @@ if selected == "Analysis":
 
         else:
             myCursor.execute(f'''
-                SELECT State, Year, SUM(Transaction_amount) AS Transaction_amount
-                from aggtrans WHERE Year = {int(selected_year)}
-                GROUP BY State, Year
+                SELECT State, Year, Transaction_amount
+                from RollupStateYear WHERE Year = {int(selected_year)}
                 ORDER BY Transaction_amount ASC
                 LIMIT 10'''
             )
@@ -435,7 +556,7 @@ if selected == "Analysis":
     if query == "3. Analyze leading states categorized by transaction type and corresponding transaction count.":
         myCursor.execute('''
             SELECT State, Transaction_Type, SUM(Transaction_Count) AS Transaction_count
-            FROM aggtrans
+            FROM RollupStateYearType
             GROUP BY State, Transaction_Type
             ORDER BY Transaction_Count DESC''')
         df = pd.DataFrame(myCursor.fetchall(), columns=['State', 'Transaction_Type', "Transaction_Count"])
@@ -470,14 +591,9 @@ if selected == "Analysis":
 
     if query == "4. Highlight top-performing States, Year and Pincode alongside their respective transaction values and registered user count.":
         myCursor.execute('''
-                        WITH toptrans_topuser
-                        AS
-                        (
-                            SELECT tt.State, tt.Year, tt.Quarter, tt.pincode, cast(tt.Transaction_Count as unsigned) AS Transaction_Count,
-                            cast(tt.Transaction_Amount as unsigned) AS Transaction_Amount, tu.Registered_User FROM toptrans tt JOIN topuser tu ON 
-                            tt.State = tu.State AND tt.Year = tu.Year AND tt.Quarter = tu.Quarter AND tt.pincode=tu.pincode ORDER BY Transaction_Count DESC
-                        )
-                        SELECT State, Year, Pincode, (sum(Transaction_Amount)/1000000) AS Transaction_Amount, SUM(Registered_User) AS Registered_User FROM toptrans_topuser GROUP BY State, Year, Pincode ORDER BY Transaction_Amount DESC LIMIT 10;'''
+                        SELECT State, Year, Pincode, (sum(cast(Transaction_Amount as unsigned integer))/1000000) AS Transaction_Amount, SUM(Registered_User) AS Registered_User
+                        FROM FactPincodeQuarter WHERE Transaction_Amount IS NOT NULL AND Registered_User IS NOT NULL
+                        GROUP BY State, Year, Pincode ORDER BY Transaction_Amount DESC LIMIT 10;'''
         )
         df = pd.DataFrame(myCursor.fetchall(),columns = ["State", "Year", "Pincode", "Transaction Amount (In Millions)", "Registered User"])
         myCursor.close()
@@ -500,15 +616,17 @@ if selected == "Analysis":
         selection = st.radio("Select criteria:", ("Lowest", "Highest"))
         if selection == "Highest":
             transaction_function = "MAX"
+            rollup_prefix = "Max"
             transaction_function1 = "highest"
             order_by = "DESC"
         else:
             transaction_function = "MIN"
+            rollup_prefix = "Min"
             transaction_function1 = "lowest"
             order_by = "ASC"
         myCursor.execute(f'''
-        SELECT State, District, {transaction_function}(Transaction_Count) AS Transaction_Count, {transaction_function}(Transaction_Amount) AS Transaction_Amount
-        FROM maptrans 
+        SELECT State, District, {transaction_function}({rollup_prefix}_Transaction_Count) AS Transaction_Count, {transaction_function}({rollup_prefix}_Transaction_Amount) AS Transaction_Amount
+        FROM RollupDistrictYearTrans
         GROUP BY State, District 
         ORDER BY Transaction_Count {order_by}, Transaction_Amount {order_by}
         LIMIT 10'''
@@ -538,16 +656,18 @@ if selected == "Analysis":
         selection = st.radio("Select criteria:", ("Lowest", "Highest"))
         if selection == "Highest":
             transaction_function = "MAX"
+            rollup_prefix = "Max"
             transaction_function1 = "highest"
             order_by = "DESC"
         else:
             transaction_function = "MIN"
+            rollup_prefix = "Min"
             transaction_function1 = "lowest"
             order_by = "ASC"
 
         myCursor.execute(f'''
-        SELECT State, District, {transaction_function}(RegisteredUsers) As Registered_Users
-        FROM mapuser
+        SELECT State, District, {transaction_function}({rollup_prefix}_RegisteredUsers) As Registered_Users
+        FROM RollupDistrictYearUser
         GROUP BY State, District
         ORDER BY Registered_Users {order_by}
         LIMIT 10''')
@@ -623,8 +743,8 @@ if selected == "Analysis":
             st.plotly_chart(fig)
 
     if query == "8. Identify the top 10 pin codes based on transaction count and amount.":
-        myCursor.execute('''SELECT tt.State, tt.Year, p.City, tt.Pincode, sum(CAST(tt.Transaction_Count AS UNSIGNED)) AS Transaction_Count, 
-                            (sum(tt.Transaction_Amount)/1000000) FROM phonepe_pulse.TopTrans tt JOIN (SELECT DISTINCT Pincode, City FROM pincode.pincode) p 
+        myCursor.execute('''SELECT tt.State, tt.Year, p.City, tt.Pincode, sum(CAST(tt.Transaction_Count AS UNSIGNED INTEGER)) AS Transaction_Count, 
+                            (sum(tt.Transaction_Amount)/1000000) FROM RollupPincodeYearTrans tt JOIN (SELECT DISTINCT Pincode, City FROM pincode.pincode) p 
                             ON tt.Pincode = p.Pincode GROUP BY tt.State, tt.Year, p.City, tt.Pincode ORDER BY Transaction_Count DESC LIMIT 10
         ''')
         df = pd.DataFrame(myCursor.fetchall(),columns=["State", "Year", "City", "Pincode", "Transaction Count", "Transaction Amount (In Million)"])
@@ -647,7 +767,7 @@ if selected == "Analysis":
 
     if query == "9. What are the top 10 cities per pincode, considering the total number of registered users, categorized by state and year?":
         myCursor.execute('''SELECT tu.State, tu.Year, p.City, tu.Pincode, SUM(tu.Registered_User) AS Total_Registered_Users
-                            FROM TopUser tu
+                            FROM RollupPincodeYearUser tu
                             JOIN (SELECT DISTINCT Pincode, City FROM pincode.pincode) p ON tu.Pincode = p.Pincode
                             GROUP BY tu.State, tu.Year, p.City, tu.Pincode
                             ORDER BY Total_Registered_Users DESC
@@ -671,7 +791,7 @@ if selected == "Analysis":
 
     if query == "10. What are the top 10 districts in terms of transaction count and amount, categorized by year?":
         myCursor.execute('''SELECT Year, District, SUM(Transaction_Count) AS Total_Transaction_Count, SUM(Transaction_Amount) AS Total_Transaction_Amount
-                        FROM maptrans GROUP BY Year, District ORDER BY Year, Total_Transaction_Count DESC, Total_Transaction_Amount DESC limit 10;
+                        FROM RollupDistrictYearTrans GROUP BY Year, District ORDER BY Year, Total_Transaction_Count DESC, Total_Transaction_Amount DESC limit 10;
         ''')
         df = pd.DataFrame(myCursor.fetchall(),columns=["Year", "District", "Transaction Count", "Transaction Amount"])
         myCursor.close()
@@ -690,8 +810,8 @@ if selected == "Analysis":
 
 
     if query == "11. What are the top 10 districts in terms of App open count?":
-        myCursor.execute('''SELECT State, District, Year, SUM(AppOpens) AS AppOpens FROM mapuser
-                         GROUP BY State, District, Year ORDER BY AppOpens DESC LIMIT 10''')
+        myCursor.execute('''SELECT State, District, Year, AppOpens FROM RollupDistrictYearUser
+                         ORDER BY AppOpens DESC LIMIT 10''')
         df = pd.DataFrame(myCursor.fetchall(),columns=["State", "District", "Year", "App Open Count"])
         myCursor.close()
         mySqlConnection.close()
@@ -713,7 +833,7 @@ if selected == "Analysis":
 
     
 if selected == "Explore Data":
-    df_aggTrans, df_aggUser, df_mapTrans, df_mapUser, df_topTrans, df_topUser = dataFrameLoader()
+    refresh = currentRefresh()
     st.write("")
     st.write("")
     st.write("")
@@ -798,53 +918,9 @@ if selected == "Explore Data":
         
         qtr = int(Quarter[1])
         if analyser == "Transactions":
-            if State == 'All':
-                filteredDfAggTrans = df_aggTrans[
-                    (df_aggTrans['Year'] == int(Year)) &
-                    (df_aggTrans['Quarter'] == qtr)            
-                ]
-                filteredDfMapTrans = df_mapTrans[
-                    (df_mapTrans['Year'] == int(Year)) &
-                    (df_mapTrans['Quarter'] == qtr)
-                ]
-                filteredDftopTrans = df_topTrans[
-                    (df_topTrans['Year'] == int(Year)) &
-                    (df_topTrans['Quarter'] == qtr)
-                ]
-                
-                filteredDfAggTrans = filteredDfAggTrans.groupby(['Year', 'Quarter','Transaction Type'])['Transaction Amount'].sum().reset_index()
-                sortedfilteredDfAggTrans = filteredDfAggTrans.sort_values(by='Transaction Amount', ascending=False)
-                filteredDfMapTrans = filteredDfMapTrans.groupby(['Year','Quarter','District'])['Transaction Amount'].sum().reset_index()
-                sortedfilteredDfMapTrans = filteredDfMapTrans.sort_values(by = 'Transaction Amount', ascending = False)
-                filteredDfTopTrans = filteredDftopTrans.groupby(['Year', 'Quarter','Pincode'])['Transaction Amount'].sum().reset_index()
-                sortedfilteredDfTopTrans =  filteredDfTopTrans.sort_values(by = 'Transaction Amount', ascending = False)
+            sortedfilteredDfAggTrans, sortedfilteredDfMapTrans, sortedfilteredDfTopTrans = exploreTransactions(refresh, int(Year), qtr, State)
 
-                
-            else:
-                filteredDfAggTrans = df_aggTrans[
-                    (df_aggTrans['Year'] == int(Year)) &
-                    (df_aggTrans['State'] == State) &
-                    (df_aggTrans['Quarter'] == qtr)            
-                ]
-                filteredDfMapTrans = df_mapTrans[
-                    (df_mapTrans['Year'] == int(Year)) &
-                    (df_mapTrans['Quarter'] == qtr) &
-                    (df_mapTrans['State'] == State)
-                ]
-                filteredDfTopTrans = df_topTrans[
-                    (df_topTrans['Year'] == int(Year)) &
-                    (df_topTrans['Quarter'] == qtr) &
-                    (df_topTrans['State'] == State)
-                ]
-
-                filteredDfAggTrans = filteredDfAggTrans.groupby(['Year', 'State', 'Quarter', 'Transaction Type'])['Transaction Amount'].sum().reset_index()
-                sortedfilteredDfAggTrans = filteredDfAggTrans.sort_values(by='Transaction Amount', ascending=False)
-                filteredDfMapTrans = filteredDfMapTrans.groupby(['Year','State', 'Quarter','District'])['Transaction Amount'].sum().reset_index()
-                sortedfilteredDfMapTrans = filteredDfMapTrans.sort_values(by = 'Transaction Amount', ascending = False)
-                filteredDfTopTrans = filteredDfTopTrans.groupby(['Year','State', 'Quarter','Pincode'])['Transaction Amount'].sum().reset_index()
-                sortedfilteredDfTopTrans =  filteredDfTopTrans.sort_values(by = 'Transaction Amount', ascending = False)
-
-            totalTransactionAmount = filteredDfAggTrans['Transaction Amount'].sum()
+            totalTransactionAmount = sortedfilteredDfAggTrans['Transaction Amount'].sum()
             totalTransactionAmount = int(totalTransactionAmount)
             formatted_amount = indianNumberFormat(totalTransactionAmount)
             try:
@@ -911,48 +987,7 @@ if selected == "Explore Data":
                 """,
                 unsafe_allow_html=True)
         else:
-            if State == 'All':
-                filteredDfAggUser = df_aggUser[
-                    (df_aggUser['Year'] == int(Year)) &
-                    (df_aggUser['Quarter'] == qtr)            
-                ]
-                filteredDfMapUser = df_mapUser[
-                    (df_mapUser['Year'] == int(Year)) &
-                    (df_mapUser['Quarter'] == qtr)
-                ]
-                filteredDftopUser = df_topUser[
-                    (df_topUser['Year'] == int(Year)) &
-                    (df_topUser['Quarter'] == qtr)
-                ]
-                
-                filteredDfAggUser = filteredDfAggUser.groupby(['Year', 'Quarter'])['User Count'].sum().reset_index()
-                sortedfilteredDfAggUser = filteredDfAggUser.sort_values(by='User Count', ascending=False)
-                filteredDfMapUser = filteredDfMapUser.groupby(['Year','Quarter','District'])['Registered Users'].sum().reset_index()
-                sortedfilteredDfMapUser = filteredDfMapUser.sort_values(by = 'Registered Users', ascending = False)
-                filteredDfTopUser = filteredDftopUser.groupby(['Year', 'Quarter','Pincode'])['Registered Users'].sum().reset_index()
-                sortedfilteredDfTopUser =  filteredDfTopUser.sort_values(by = 'Registered Users', ascending = False)
-            else:
-                filteredDfAggUser = df_aggUser[
-                    (df_aggUser['Year'] == int(Year)) &
-                    (df_aggUser['State'] == State) &
-                    (df_aggUser['Quarter'] == qtr)            
-                ]
-                filteredDfMapUser = df_mapUser[
-                    (df_mapUser['Year'] == int(Year)) &
-                    (df_mapUser['Quarter'] == qtr) &
-                    (df_mapUser['State'] == State)
-                ]
-                filteredDfTopUser = df_topUser[
-                    (df_topUser['Year'] == int(Year)) &
-                    (df_topUser['Quarter'] == qtr) &
-                    (df_topUser['State'] == State)
-                ]
-                filteredDfAggUser = filteredDfAggUser.groupby(['Year', 'State', 'Quarter'])['User Count'].sum().reset_index()
-                sortedfilteredDfAggUser = filteredDfAggUser.sort_values(by='User Count', ascending=False)
-                filteredDfMapUser = filteredDfMapUser.groupby(['Year','State', 'Quarter','District'])['Registered Users'].sum().reset_index()
-                sortedfilteredDfMapUser = filteredDfMapUser.sort_values(by = 'Registered Users', ascending = False)
-                filteredDfTopUser = filteredDfTopUser.groupby(['Year','State', 'Quarter','Pincode'])['Registered Users'].sum().reset_index()
-                sortedfilteredDfTopUser =  filteredDfTopUser.sort_values(by = 'Registered Users', ascending = False)
+            filteredDfAggUser, sortedfilteredDfMapUser, sortedfilteredDfTopUser = exploreUsers(refresh, int(Year), qtr, State)
 
             totalTransactionAmount = filteredDfAggUser['User Count'].sum()
             totalTransactionAmount = int(totalTransactionAmount)
@@ -1020,14 +1055,10 @@ if selected == "Explore Data":
     with subcol2:
         st.write()
     with subcol3:
-        indianstate = "https://gist.githubusercontent.com/jbrobst/56c13bbbf9d97d187fea01ca62ea5112/raw/e388c4cae20aa53cb5090210a42ebb9b765c0a36/india_states.geojson"
+        indianstate = indiaStatesGeoJson()
         if State == "All":
             if analyser == "Transactions":
-                result_df = df_aggTrans[(df_aggTrans['Year'] == int(Year)) & (df_aggTrans['Quarter'] == qtr)].groupby(['State', 'Quarter']).agg({
-                    'Transaction Amount': ['mean', 'sum'],
-                    'Transaction Count': 'sum'
-                }).reset_index()
-                result_df.columns = ['State',"Quarter", 'Avg_transaction_amount', 'Total_transaction_amount', 'Total_transaction_count']
+                result_df = exploreMap(refresh, analyser, int(Year), qtr, State)
                 base_map = go.Figure()
                 base_map.update_layout(
                 mapbox=dict(
@@ -1043,13 +1074,11 @@ if selected == "Explore Data":
                 # Create choropleth figure with go
                 choropleth_map = go.Figure()
                 hover_text = (
-                    result_df['State'] + '<br>' + 
+                    result_df['State'].astype(str) + '<br>' + 
                     'Transactions Amount: ' + (result_df['Total_transaction_amount'] // 1000000).astype(str) + 'M' + '</br>' +
                     'Avg_transaction_amount: ' + (result_df['Avg_transaction_amount'] // 1000000).astype(str) + 'M' +
                     '<br>Transactions Count: ' + result_df['Total_transaction_count'].astype(str)
                 )
-                # indianstate = "https://gist.githubusercontent.com/jbrobst/56c13bbbf9d97d187fea01ca62ea5112/raw/e388c4cae20aa53cb5090210a42ebb9b765c0a36/india_states.geojson"
-                response = requests.get(indianstate)   
                 choropleth_map.add_trace(go.Choroplethmapbox(
                 geojson = indianstate,
                 locations=result_df['State'],
@@ -1066,11 +1095,7 @@ if selected == "Explore Data":
                 # Show the combined map
                 st.plotly_chart(base_map)
             else:
-                result_df = df_aggUser[(df_aggUser['Year'] == int(Year)) & (df_aggUser['Quarter'] == qtr)].groupby(['State', 'Quarter']).agg({
-                    'User Count': 'sum',
-                    'User Percentage': 'sum'
-                }).reset_index()
-                result_df.columns = ['State',"Quarter", 'User Count', 'User Percentage']
+                result_df = exploreMap(refresh, analyser, int(Year), qtr, State)
                 base_map = go.Figure()
                 base_map.update_layout(
                 mapbox=dict(
@@ -1086,12 +1111,10 @@ if selected == "Explore Data":
                 # Create choropleth figure with go
                 choropleth_map = go.Figure()
                 hover_text = (
-                    result_df['State'] + '<br>' + 
+                    result_df['State'].astype(str) + '<br>' + 
                     'User Count: ' + (result_df['User Count'] // 1000).astype(str) + 'K' + '</br>' +
                     'User Percentage: ' + result_df['User Percentage'].astype(str)
                 )
-                # indianstate = "https://gist.githubusercontent.com/jbrobst/56c13bbbf9d97d187fea01ca62ea5112/raw/e388c4cae20aa53cb5090210a42ebb9b765c0a36/india_states.geojson"
-                response = requests.get(indianstate)   
                 choropleth_map.add_trace(go.Choroplethmapbox(
                 geojson = indianstate,
                 locations=result_df['State'],
@@ -1105,11 +1128,7 @@ if selected == "Explore Data":
                 st.plotly_chart(base_map)
         else:
             if analyser == "Transactions":
-                result_df = df_aggTrans[(df_aggTrans['Year'] == int(Year)) & (df_aggTrans['Quarter'] == qtr) & (df_aggTrans['State'] == State)].groupby(['State', 'Quarter']).agg({
-                    'Transaction Amount': ['mean', 'sum'],
-                    'Transaction Count': 'sum'
-                }).reset_index()
-                result_df.columns = ['State',"Quarter", 'Avg_transaction_amount', 'Total_transaction_amount', 'Total_transaction_count']
+                result_df = exploreMap(refresh, analyser, int(Year), qtr, State)
                 base_map = go.Figure()
                 base_map.update_layout(
                 mapbox=dict(
@@ -1124,13 +1143,11 @@ if selected == "Explore Data":
 
                 choropleth_map = go.Figure()
                 hover_text = (
-                    result_df['State'] + '<br>' + 
+                    result_df['State'].astype(str) + '<br>' + 
                     'Transactions Amount: ' + (result_df['Total_transaction_amount'] // 1000000).astype(str) + 'M' + '</br>' +
                     'Avg_transaction_amount: ' + (result_df['Avg_transaction_amount'] // 1000000).astype(str) + 'M' +
                     '<br>Transactions Count: ' + result_df['Total_transaction_count'].astype(str)
                 )
-                # indianstate = "https://gist.githubusercontent.com/jbrobst/56c13bbbf9d97d187fea01ca62ea5112/raw/e388c4cae20aa53cb5090210a42ebb9b765c0a36/india_states.geojson"
-                response = requests.get(indianstate)   
                 choropleth_map.add_trace(go.Choroplethmapbox(
                 geojson = indianstate,
                 locations=result_df['State'],
@@ -1143,11 +1160,7 @@ if selected == "Explore Data":
                 base_map.add_trace(choropleth_map.data[0])
                 st.plotly_chart(base_map)
             else:
-                result_df = df_aggUser[(df_aggUser['Year'] == int(Year)) & (df_aggUser['Quarter'] == qtr) & (df_aggUser['State'] == State)].groupby(['State', 'Quarter']).agg({
-                    'User Count': 'sum',
-                    'User Percentage': 'sum'
-                }).reset_index()
-                result_df.columns = ['State',"Quarter", 'User Count', 'User Percentage']
+                result_df = exploreMap(refresh, analyser, int(Year), qtr, State)
                 base_map = go.Figure()
                 base_map.update_layout(
                 mapbox=dict(
@@ -1163,12 +1176,10 @@ if selected == "Explore Data":
                 # Create choropleth figure with go
                 choropleth_map = go.Figure()
                 hover_text = (
-                    result_df['State'] + '<br>' + 
+                    result_df['State'].astype(str) + '<br>' + 
                     'User Count: ' + (result_df['User Count'] // 1000).astype(str) + 'K' + '</br>' +
                     'User Percentage: ' + result_df['User Percentage'].astype(str)
                 )
-                # indianstate = "https://gist.githubusercontent.com/jbrobst/56c13bbbf9d97d187fea01ca62ea5112/raw/e388c4cae20aa53cb5090210a42ebb9b765c0a36/india_states.geojson"
-                response = requests.get(indianstate)   
                 choropleth_map.add_trace(go.Choroplethmapbox(
                 geojson = indianstate,
                 locations=result_df['State'],
@@ -0,0 +1,271 @@
+# Importing required libraries
+import os
+import json
+import math
+import hashlib
+import argparse
+import tempfile
+import urllib.request
+
+
+# ___*___*___*___*___*___ State Map Settings ___*___*___*___*___*___ #
+
+# GeoJSON of the Indian state boundaries, matched to the Pulse states on their 'ST_NM' property
+statesGeoJsonUrl = os.environ.get(
+    'PULSE_GEOJSON_URL',
+    "https://gist.githubusercontent.com/jbrobst/56c13bbbf9d97d187fea01ca62ea5112/raw/e388c4cae20aa53cb5090210a42ebb9b765c0a36/india_states.geojson"
+)
+
+# GeoJSON bundled with the repository, used instead of the download when it is present
+bundledGeoJsonPath = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Miscellaneous_Files', 'india_states.geojson')
+
+# Folder, outside the source tree, the GeoJSON is downloaded to (as india_states.download.geojson) and its simplified
+# versions are cached in
+geoJsonFolder = os.environ.get(
+    'PULSE_GEOJSON_FOLDER',
+    os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')), 'phonepe_pulse')
+)
+
+# Douglas-Peucker tolerance of the simplified boundaries, in degrees (0.01 is about 1 km); 0 keeps every point
+simplifyTolerance = float(os.environ.get('PULSE_GEOJSON_TOLERANCE', 0.01))
+
+# Decimal places the coordinates are rounded to (3 is about 100 m)
+coordinateDigits = int(os.environ.get('PULSE_GEOJSON_DIGITS', 3))
+
+# Feature properties kept in the simplified GeoJSON: the maps only match the states on their name
+keptProperties = ('ST_NM',)
+
+
+# ___*___*___*___*___*___ Geometry Simplification ___*___*___*___*___*___ #
+
+def pointLineDistance(point, start, end):
+    """
+    Returns the distance from a point to the line through two points, or to the first of them when they coincide.
+    """
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    if dx == 0 and dy == 0:
+        return math.hypot(point[0] - start[0], point[1] - start[1])
+    return abs(dy * (point[0] - start[0]) - dx * (point[1] - start[1])) / math.hypot(dx, dy)
+
+
+def douglasPeucker(points, tolerance):
+    """
+    Simplifies a line with the Douglas-Peucker algorithm: only the points farther than the tolerance from the
+    line simplified so far are kept. Both ends are always kept.
+
+    Args:
+    - points (list): The [x, y] coordinates of the line.
+    - tolerance (float): The largest distance a dropped point may be from the simplified line.
+
+    Returns:
+    - points (list): The coordinates kept, in order.
+    """
+    if len(points) < 3 or tolerance <= 0:
+        return list(points)
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    # Iterative rather than recursive, as a state boundary has tens of thousands of points
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        farthest, farthestDistance = None, tolerance
+        for index in range(first + 1, last):
+            distance = pointLineDistance(points[index], points[first], points[last])
+            if distance > farthestDistance:
+                farthest, farthestDistance = index, distance
+        if farthest is not None:
+            keep[farthest] = True
+            stack += [(first, farthest), (farthest, last)]
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def roundedPoints(points, digits):
+    """
+    Rounds coordinates to a number of decimal places, dropping the points that fall onto the previous one.
+    """
+    rounded = []
+    for point in points:
+        point = [round(point[0], digits), round(point[1], digits)]
+        if not rounded or point != rounded[-1]:
+            rounded.append(point)
+    return rounded
+
+
+def simplifyRing(ring, tolerance, digits):
+    """
+    Simplifies and rounds a closed ring of a polygon.
+
+    Returns:
+    - ring (list): The simplified ring, or None when it collapses to less than a triangle.
+    """
+    for points in (douglasPeucker(ring, tolerance), ring):
+        # A ring too small for the tolerance (e.g. a small island) is only rounded
+        simplified = roundedPoints(points, digits)
+        if len(simplified) >= 4:
+            return simplified
+    return None
+
+
+def simplifyPolygon(rings, tolerance, digits):
+    """
+    Simplifies the rings of a polygon, dropping its holes that collapse.
+
+    Returns:
+    - rings (list): The simplified rings, or None when the outer ring collapses.
+    """
+    outer = simplifyRing(rings[0], tolerance, digits)
+    if outer is None:
+        return None
+    holes = [simplifyRing(ring, tolerance, digits) for ring in rings[1:]]
+    return [outer] + [hole for hole in holes if hole is not None]
+
+
+def simplifyGeometry(geometry, tolerance, digits):
+    """
+    Simplifies a Polygon or MultiPolygon geometry. Other geometries are returned as they are.
+
+    Args:
+    - geometry (dict): The GeoJSON geometry.
+    - tolerance (float): The Douglas-Peucker tolerance, in the units of the coordinates.
+    - digits (int): The decimal places the coordinates are rounded to.
+
+    Returns:
+    - geometry (dict): The simplified geometry.
+    """
+    if geometry['type'] == 'Polygon':
+        rings = simplifyPolygon(geometry['coordinates'], tolerance, digits)
+        return {'type': 'Polygon', 'coordinates': rings or geometry['coordinates']}
+    if geometry['type'] == 'MultiPolygon':
+        polygons = [simplifyPolygon(rings, tolerance, digits) for rings in geometry['coordinates']]
+        polygons = [rings for rings in polygons if rings is not None]
+        return {'type': 'MultiPolygon', 'coordinates': polygons or geometry['coordinates']}
+    return geometry
+
+
+def simplifyFeatures(geoJson, tolerance=None, digits=None):
+    """
+    Simplifies every feature of a GeoJSON feature collection, keeping only the properties the maps use.
+
+    Args:
+    - geoJson (dict): The GeoJSON feature collection.
+    - tolerance (float): The Douglas-Peucker tolerance, in degrees. Defaults to 'simplifyTolerance'.
+    - digits (int): The decimal places the coordinates are rounded to. Defaults to 'coordinateDigits'.
+
+    Returns:
+    - geoJson (dict): The simplified feature collection.
+    """
+    tolerance = simplifyTolerance if tolerance is None else tolerance
+    digits = coordinateDigits if digits is None else digits
+    features = []
+    for feature in geoJson['features']:
+        features.append({
+            'type': 'Feature',
+            'properties': {name: value for name, value in feature['properties'].items() if name in keptProperties},
+            'geometry': simplifyGeometry(feature['geometry'], tolerance, digits),
+        })
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+# ___*___*___*___*___*___ State Map Cache ___*___*___*___*___*___ #
+
+def writeJson(document, path):
+    """
+    Writes a JSON document compactly, replacing the file at once so that concurrent readers never see it half written.
+    """
+    descriptor, temporaryPath = tempfile.mkstemp(dir = os.path.dirname(path), suffix = '.tmp')
+    with os.fdopen(descriptor, 'w') as fileHandle:
+        json.dump(document, fileHandle, separators = (',', ':'))
+    os.replace(temporaryPath, path)
+
+
+def simplifiedGeoJsonPath(sourcePath, tolerance, digits, folder=None):
+    """
+    Returns the cache file of a states GeoJSON simplified to a tolerance and number of decimal places. Its name
+    carries a hash of the path, size and mtime of the full GeoJSON, so that switching between the bundled copy
+    and the download, or updating either of them, simplifies it again.
+    """
+    sourceStat = os.stat(sourcePath)
+    sourceKey = hashlib.sha256(f"{os.path.abspath(sourcePath)}:{sourceStat.st_size}:{sourceStat.st_mtime_ns}".encode()).hexdigest()[:12]
+    return os.path.join(
+        geoJsonFolder if folder is None else folder, f"india_states.simplified.{sourceKey}.{tolerance:g}.{digits}.geojson"
+    )
+
+
+def statesGeoJsonSource(folder=None):
+    """
+    Returns the full GeoJSON of the states: the bundled copy when there is one, otherwise the copy downloaded
+    into the cache folder, downloading it the first time.
+
+    Args:
+    - folder (str): The cache folder. Defaults to 'geoJsonFolder'.
+
+    Returns:
+    - path (str): The path of the GeoJSON file.
+    """
+    if os.path.exists(bundledGeoJsonPath):
+        return bundledGeoJsonPath
+    folder = geoJsonFolder if folder is None else folder
+    downloadPath = os.path.join(folder, 'india_states.download.geojson')
+    if not os.path.exists(downloadPath):
+        os.makedirs(folder, exist_ok = True)
+        with urllib.request.urlopen(statesGeoJsonUrl, timeout = 60) as response:
+            document = json.load(response)
+        writeJson(document, downloadPath)
+    return downloadPath
+
+
+def loadStatesGeoJson(tolerance=None, digits=None, folder=None):
+    """
+    Loads the simplified GeoJSON of the Indian states. It is simplified (and downloaded, unless bundled) the
+    first time only, and again whenever the full GeoJSON changes; otherwise it is read from the cache folder,
+    without any network access.
+
+    Args:
+    - tolerance (float): The Douglas-Peucker tolerance, in degrees. Defaults to 'simplifyTolerance'.
+    - digits (int): The decimal places the coordinates are rounded to. Defaults to 'coordinateDigits'.
+    - folder (str): The cache folder. Defaults to 'geoJsonFolder'.
+
+    Returns:
+    - geoJson (dict): The simplified feature collection.
+    """
+    tolerance = simplifyTolerance if tolerance is None else tolerance
+    digits = coordinateDigits if digits is None else digits
+    folder = geoJsonFolder if folder is None else folder
+    sourcePath = statesGeoJsonSource(folder)
+    simplifiedPath = simplifiedGeoJsonPath(sourcePath, tolerance, digits, folder)
+    if os.path.exists(simplifiedPath):
+        with open(simplifiedPath) as fileHandle:
+            return json.load(fileHandle)
+
+    with open(sourcePath) as fileHandle:
+        geoJson = simplifyFeatures(json.load(fileHandle), tolerance, digits)
+    os.makedirs(folder, exist_ok = True)
+    writeJson(geoJson, simplifiedPath)
+    return geoJson
+
+
+def main(argv=None):
+    """
+    Downloads and simplifies the states GeoJSON ahead of the first Explorer run, and reports the size saved.
+
+    Args:
+    - argv (list of str): The command line arguments. Defaults to 'sys.argv'.
+    """
+    parser = argparse.ArgumentParser(description = 'Caches the simplified GeoJSON of the Indian states used by the Explorer maps.')
+    parser.add_argument('--tolerance', type = float, default = simplifyTolerance, help = 'Douglas-Peucker tolerance, in degrees')
+    parser.add_argument('--digits', type = int, default = coordinateDigits, help = 'decimal places kept in the coordinates')
+    parser.add_argument('--folder', default = geoJsonFolder, help = 'cache folder of the GeoJSON files')
+    arguments = parser.parse_args(argv)
+
+    sourcePath = statesGeoJsonSource(arguments.folder)
+    simplifiedPath = simplifiedGeoJsonPath(sourcePath, arguments.tolerance, arguments.digits, arguments.folder)
+    if os.path.exists(simplifiedPath):
+        os.remove(simplifiedPath)
+    loadStatesGeoJson(arguments.tolerance, arguments.digits, arguments.folder)
+    sourceSize = os.path.getsize(sourcePath)
+    simplifiedSize = os.path.getsize(simplifiedPath)
+    print(f"{simplifiedPath}: {simplifiedSize / 1024:.0f} KB, {simplifiedSize / sourceSize:.1%} of the original {sourceSize / 1024:.0f} KB")
+
+
+if __name__ == '__main__':
+    main()
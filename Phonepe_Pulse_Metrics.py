@@ -0,0 +1,196 @@
+# Importing required libraries
+import os
+import sys
+import json
+import time
+import datetime
+import tracemalloc
+import contextlib
+import urllib.request
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, where the peak RSS is not reported
+    resource = None
+
+
+# ___*___*___*___*___*___ Run Metrics Settings ___*___*___*___*___*___ #
+
+# Counters recorded for every (dataset, stage) of a run
+stageCounters = ('seconds', 'calls', 'files', 'rows', 'bytes')
+
+# Also trace the Python allocations of every stage with tracemalloc, which slows the run down noticeably
+traceMemory = os.environ.get('PULSE_TRACE_MEMORY', '0') == '1'
+
+# URL the JSON run report is POSTed to at the end of a run, if any
+metricsUrl = os.environ.get('PULSE_METRICS_URL')
+
+
+# ___*___*___*___*___*___ Run Metrics ___*___*___*___*___*___ #
+
+def peakRss(children=False):
+    """
+    Returns the peak resident set size of this process, or of its finished child processes, in MB, or None
+    where it cannot be measured.
+
+    Args:
+    - children (bool): Whether to measure the finished child processes (e.g. the extraction workers).
+    """
+    if resource is None:
+        return None
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    unit = 1 if sys.platform == 'darwin' else 1024
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    return round(usage.ru_maxrss * unit / 1024 ** 2, 1)
+
+
+class RunMetrics:
+    """
+    Collects the wall time, files, rows and bytes processed and the peak memory of every (dataset, stage) of
+    a run. Work units running in worker processes collect their own metrics, which are merged back into the
+    run's; the seconds of a stage run by several workers are summed over them.
+    """
+
+    def __init__(self, trace=None):
+        self.trace = traceMemory if trace is None else trace
+        if self.trace and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.stages = {}
+        self.peakStack = []
+        self.startedAt = datetime.datetime.now().isoformat(timespec = 'seconds')
+        self.startTime = time.perf_counter()
+
+    def add(self, dataset, stage, peakRssMB=None, peakTracedMB=None, **counters):
+        """
+        Adds counters to a (dataset, stage), and keeps the highest peak memory seen for it.
+        """
+        entry = self.stages.setdefault((dataset, stage), {**dict.fromkeys(stageCounters, 0), 'peakRssMB': None, 'peakTracedMB': None})
+        for counter, value in counters.items():
+            entry[counter] += value
+        for peak, value in (('peakRssMB', peakRssMB), ('peakTracedMB', peakTracedMB)):
+            if value is not None and (entry[peak] is None or value > entry[peak]):
+                entry[peak] = value
+
+    @contextlib.contextmanager
+    def measure(self, dataset, stage):
+        """
+        Times a block of code as one call of a (dataset, stage). The block can fill in the files, rows and
+        bytes it processed in the dictionary it is given.
+        """
+        counters = {'files': 0, 'rows': 0, 'bytes': 0}
+        tracing = self.trace and tracemalloc.is_tracing()
+        if tracing:
+            # The enclosing stage keeps the peak reached so far, before it is reset for this one
+            if self.peakStack:
+                self.peakStack[-1] = max(self.peakStack[-1], tracemalloc.get_traced_memory()[1])
+            self.peakStack.append(0)
+            tracemalloc.reset_peak()
+
+        startTime = time.perf_counter()
+        try:
+            yield counters
+        finally:
+            seconds = time.perf_counter() - startTime
+            peakTracedMB = None
+            if tracing:
+                peakTracedMB = round(max(self.peakStack.pop(), tracemalloc.get_traced_memory()[1]) / 1024 ** 2, 1)
+            self.add(dataset, stage, peakRss(), peakTracedMB, seconds = seconds, calls = 1, **counters)
+
+    def counters(self):
+        """
+        Returns the collected metrics in a picklable form, to be sent back from a worker process.
+        """
+        return dict(self.stages)
+
+    def merge(self, stages):
+        """
+        Adds the metrics collected by a worker process (see 'counters').
+        """
+        for (dataset, stage), entry in stages.items():
+            counters = {counter: entry[counter] for counter in stageCounters}
+            self.add(dataset, stage, entry['peakRssMB'], entry['peakTracedMB'], **counters)
+
+    def report(self, **details):
+        """
+        Builds the JSON run report: the metrics of every (dataset, stage), their totals per dataset, and the
+        peak memory of the run.
+
+        Args:
+        - details: Extra fields of the report, e.g. the command line.
+
+        Returns:
+        - report (dict): The run report.
+        """
+        stages = []
+        datasets = {}
+        for (dataset, stage), entry in self.stages.items():
+            stages.append({'dataset': dataset, 'stage': stage, **entry, 'seconds': round(entry['seconds'], 4)})
+            totals = datasets.setdefault(dataset, {**dict.fromkeys(stageCounters, 0), 'peakRssMB': None, 'peakTracedMB': None})
+            for counter in ('seconds', 'bytes'):
+                totals[counter] += entry[counter]
+            for counter in ('files', 'rows'):
+                # Files and rows flow through every stage, so the dataset processed as many as its busiest stage
+                totals[counter] = max(totals[counter], entry[counter])
+            totals['calls'] += entry['calls']
+            for peak in ('peakRssMB', 'peakTracedMB'):
+                if entry[peak] is not None and (totals[peak] is None or entry[peak] > totals[peak]):
+                    totals[peak] = entry[peak]
+        for totals in datasets.values():
+            totals['seconds'] = round(totals['seconds'], 4)
+
+        return {
+            **details,
+            'startedAt': self.startedAt,
+            'finishedAt': datetime.datetime.now().isoformat(timespec = 'seconds'),
+            'seconds': round(time.perf_counter() - self.startTime, 3),
+            'peakRssMB': peakRss(),
+            'peakWorkerRssMB': peakRss(children = True),
+            'stages': stages,
+            'datasets': datasets,
+        }
+
+    def printSummary(self):
+        """
+        Prints one line per (dataset, stage), in the order they first ran.
+        """
+        for (dataset, stage), entry in self.stages.items():
+            counts = ''.join(f", {entry[counter]} {counter}" for counter in ('files', 'rows', 'bytes') if entry[counter])
+            print(f"{dataset} {stage}: {entry['seconds']:.3f}s{counts}, peak RSS {entry['peakRssMB']} MB")
+
+
+def writeRunReport(report, path):
+    """
+    Writes a run report to a JSON file.
+
+    Args:
+    - report (dict): The run report (see 'RunMetrics.report').
+    - path (str): The path of the JSON file.
+    """
+    with open(path, 'w') as fileHandle:
+        json.dump(report, fileHandle, indent = 2)
+
+
+def publishRunReport(report, url=None):
+    """
+    POSTs a run report as JSON to a metrics endpoint. A failure is reported but does not fail the run.
+
+    Args:
+    - report (dict): The run report (see 'RunMetrics.report').
+    - url (str): The URL of the endpoint. Defaults to 'metricsUrl'.
+
+    Returns:
+    - published (bool): Whether the endpoint accepted the report.
+    """
+    url = metricsUrl if url is None else url
+    if not url:
+        return False
+    request = urllib.request.Request(
+        url, data = json.dumps(report).encode(), headers = {'Content-Type': 'application/json'}, method = 'POST'
+    )
+    try:
+        with urllib.request.urlopen(request, timeout = 10) as response:
+            return 200 <= response.status < 300
+    except OSError as e:
+        print(f"Could not publish the run report to {url}: {e}")
+        return False
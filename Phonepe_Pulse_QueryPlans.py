@@ -0,0 +1,155 @@
+# Importing required libraries
+import re
+import sys
+import sqlite3
+from Phonepe_Pulse_Database import connectToServer, databaseName, tableSchemas, rollupSchemas
+
+
+# ___*___*___*___*___*___ Explorer Queries ___*___*___*___*___*___ #
+
+# The queries issued by the Analysis and Explore Data pages, with representative parameters. The aggregate cube of
+# the Explore Data page reads whole tables on purpose, once per refresh, and is not checked
+explorerQueries = {
+    'Data available up to': '''
+        SELECT year, quarter FROM aggtrans ORDER BY year desc, quarter desc LIMIT 1''',
+    'Analysis 1/2 - all years': '''
+        SELECT State, Year, Transaction_amount FROM RollupStateYear ORDER BY Transaction_amount DESC LIMIT 10''',
+    'Analysis 1/2 - one year': '''
+        SELECT State, Year, Transaction_amount FROM RollupStateYear WHERE Year = 2022 ORDER BY Transaction_amount DESC LIMIT 10''',
+    'Analysis 3': '''
+        SELECT State, Transaction_Type, SUM(Transaction_Count) AS Transaction_count
+        FROM RollupStateYearType GROUP BY State, Transaction_Type ORDER BY Transaction_Count DESC''',
+    'Analysis 4': '''
+        SELECT State, Year, Pincode, SUM(Transaction_Amount), SUM(Registered_User) FROM FactPincodeQuarter
+        WHERE Transaction_Amount IS NOT NULL AND Registered_User IS NOT NULL GROUP BY State, Year, Pincode''',
+    'Analysis 5': '''
+        SELECT State, District, MAX(Max_Transaction_Count) AS Transaction_Count, MAX(Max_Transaction_Amount) AS Transaction_Amount
+        FROM RollupDistrictYearTrans GROUP BY State, District ORDER BY Transaction_Count DESC, Transaction_Amount DESC LIMIT 10''',
+    'Analysis 6': '''
+        SELECT State, District, MAX(Max_RegisteredUsers) As Registered_Users
+        FROM RollupDistrictYearUser GROUP BY State, District ORDER BY Registered_Users DESC LIMIT 10''',
+    'Analysis 7': '''
+        SELECT State, Year, Brand_Name, User_Count, User_Percentage FROM agguser ORDER BY User_Count DESC LIMIT 10''',
+    'Analysis 8': '''
+        SELECT tt.State, tt.Year, p.City, tt.Pincode, SUM(tt.Transaction_Count) AS Transaction_Count
+        FROM RollupPincodeYearTrans tt JOIN (SELECT DISTINCT Pincode, City FROM pincode.pincode) p ON tt.Pincode = p.Pincode
+        GROUP BY tt.State, tt.Year, p.City, tt.Pincode ORDER BY Transaction_Count DESC LIMIT 10''',
+    'Analysis 9': '''
+        SELECT tu.State, tu.Year, p.City, tu.Pincode, SUM(tu.Registered_User) AS Total_Registered_Users
+        FROM RollupPincodeYearUser tu JOIN (SELECT DISTINCT Pincode, City FROM pincode.pincode) p ON tu.Pincode = p.Pincode
+        GROUP BY tu.State, tu.Year, p.City, tu.Pincode ORDER BY Total_Registered_Users DESC LIMIT 10''',
+    'Analysis 10': '''
+        SELECT Year, District, SUM(Transaction_Count) AS Total_Transaction_Count, SUM(Transaction_Amount) AS Total_Transaction_Amount
+        FROM RollupDistrictYearTrans GROUP BY Year, District ORDER BY Year, Total_Transaction_Count DESC, Total_Transaction_Amount DESC LIMIT 10''',
+    'Analysis 11': '''
+        SELECT State, District, Year, AppOpens FROM RollupDistrictYearUser ORDER BY AppOpens DESC LIMIT 10''',
+    'Explore Data - India transactions': '''
+        SELECT Transaction_Type, Transaction_Amount FROM countrytrans
+        WHERE State = 'India' AND Year = 2022 AND Quarter = 1 ORDER BY Transaction_Amount DESC''',
+    'Explore Data - districts': '''
+        SELECT District, Transaction_Amount FROM topdistricttrans
+        WHERE State = 'Tamil Nadu' AND Year = 2022 AND Quarter = 1 ORDER BY Transaction_Amount DESC LIMIT 10''',
+    'Explore Data - pincodes': '''
+        SELECT Pincode, SUM(Transaction_Amount) AS Transaction_Amount FROM toptrans
+        WHERE Year = 2022 AND Quarter = 1 GROUP BY Pincode ORDER BY Transaction_Amount DESC LIMIT 10''',
+    'Explore Data - India users': '''
+        SELECT RegisteredUsers FROM countryuser WHERE State = 'India' AND Year = 2022 AND Quarter = 1''',
+    'Explore Data - user districts': '''
+        SELECT District, RegisteredUsers FROM countrytopdistrictuser
+        WHERE State = 'India' AND Year = 2022 AND Quarter = 1 ORDER BY RegisteredUsers DESC LIMIT 10''',
+    'Explore Data - user pincodes': '''
+        SELECT Pincode, SUM(Registered_User) AS Registered_User FROM topuser
+        WHERE Year = 2022 AND Quarter = 1 AND State = 'Tamil Nadu' GROUP BY Pincode ORDER BY Registered_User DESC LIMIT 10''',
+}
+
+
+# ___*___*___*___*___*___ Query Plan Check ___*___*___*___*___*___ #
+
+def sqlitePlanStep(detail):
+    """
+    Converts a step of a SQLite query plan into the EXPLAIN columns of MySQL used by the check: a table
+    scanned without an index becomes type 'ALL', a scan of an index type 'index' and an index lookup type 'ref'.
+
+    Args:
+    - detail (str): The detail of the step, e.g. 'SEARCH AggTrans USING INDEX AggTrans_idx_year_state (Year=?)'.
+
+    Returns:
+    - step (dict): The 'table', 'type', 'key' and 'Extra' of the step.
+    """
+    match = re.match(r'(SCAN|SEARCH) (\S+)', detail)
+    if match is None:
+        return {'table': None, 'type': None, 'key': None, 'Extra': detail}
+    operation, table = match.groups()
+    index = re.search(r'INDEX (\S+)', detail)
+    key = index.group(1) if index else ('PRIMARY' if 'PRIMARY KEY' in detail else None)
+    if operation == 'SEARCH':
+        planType = 'ref'
+    else:
+        planType = 'ALL' if ' USING ' not in detail else 'index'
+    return {'table': table, 'type': planType, 'key': key, 'Extra': detail}
+
+
+def explainQuery(cursor, query):
+    """
+    Retrieves the execution plan of a query.
+
+    Args:
+    - cursor (object): MySQL or SQLite cursor object, on the Pulse database.
+    - query (str): The query to explain.
+
+    Returns:
+    - plan (list of dict): One dictionary per step of the plan, keyed by the EXPLAIN columns.
+    """
+    if isinstance(cursor, sqlite3.Cursor):
+        # The detail of each step is the last column of EXPLAIN QUERY PLAN
+        cursor.execute('EXPLAIN QUERY PLAN ' + query)
+        return [sqlitePlanStep(row[-1]) for row in cursor.fetchall()]
+
+    cursor.execute('EXPLAIN ' + query)
+    columns = [description[0] for description in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def checkQueryPlans(connection, queries=None):
+    """
+    Explains every Explorer query and reports the steps reading a Pulse table with a full table scan.
+
+    Args:
+    - connection (object): MySQL or SQLite connection object, on the Pulse database.
+    - queries (dict): The queries to check, keyed by name. Defaults to 'explorerQueries'.
+
+    Returns:
+    - fullScans (list of tuple): The (query name, table) pairs read with a full table scan.
+    """
+    queries = explorerQueries if queries is None else queries
+    pulseTables = {table.lower() for table in list(tableSchemas) + list(rollupSchemas)}
+    myCursor = connection.cursor()
+    fullScans = []
+
+    for name, query in queries.items():
+        try:
+            plan = explainQuery(myCursor, query)
+        except Exception as e:
+            print(f"{name}: skipped ({e})")
+            continue
+
+        print(name)
+        for step in plan:
+            print(f"    table={step.get('table')} type={step.get('type')} key={step.get('key')} "
+                  f"rows={step.get('rows')} extra={step.get('Extra')}")
+            if step.get('type') == 'ALL' and str(step.get('table')).lower() in pulseTables:
+                fullScans.append((name, step.get('table')))
+
+    myCursor.close()
+    print(f"\n{len(fullScans)} full table scan(s) found")
+    for name, table in fullScans:
+        print(f"    {name}: {table}")
+    return fullScans
+
+
+if __name__ == '__main__':
+    # Exit with an error status when a query still scans a whole Pulse table
+    myConnection = connectToServer(databaseName)
+    fullScans = checkQueryPlans(myConnection)
+    myConnection.close()
+    sys.exit(1 if fullScans else 0)
@@ -0,0 +1,263 @@
+# Importing required libraries
+import os
+import hashlib
+import subprocess
+import tarfile
+import threading
+import zipfile
+
+
+# ___*___*___*___*___*___ Pulse Data Sources ___*___*___*___*___*___ #
+
+# Top-level folders of the Pulse 'data' folder, used to find it inside an archive
+pulseDataFolders = ('aggregated', 'map', 'top')
+
+# Archive handles, tree indexes and git readers opened by this process, keyed by (process id, source).
+# Sources are pickled into every work unit, so they only carry their location and find their open state here.
+openedSources = {}
+
+
+def contentFingerprint(size, mtime, readContent, previous=None):
+    """
+    Computes the size, mtime and content hash of a file. The hash is only recomputed when the size or
+    mtime differs from the previous fingerprint.
+
+    Args:
+    - size (int): The size of the file.
+    - mtime (int or str): The modification time of the file, or any value that changes with its content.
+    - readContent (function): Returns the content of the file, only called when the hash is needed.
+    - previous (dict): The fingerprint recorded in the manifest, if any.
+
+    Returns:
+    - fingerprint (dict): The 'size', 'mtime' and 'sha256' of the file.
+    """
+    if previous is not None and previous['size'] == size and previous['mtime'] == mtime:
+        return previous
+    return {'size': size, 'mtime': mtime, 'sha256': hashlib.sha256(readContent()).hexdigest()}
+
+
+def treeIndex(paths):
+    """
+    Indexes the files of an archive or a git tree as a folder tree.
+
+    Args:
+    - paths (iterable of tuple): The path parts of every file, relative to the Pulse 'data' folder.
+
+    Returns:
+    - children (dict): The names in each folder, in the order they appear, keyed by the folder path parts.
+    """
+    children = {}
+    for parts in paths:
+        for depth in range(len(parts)):
+            names = children.setdefault(parts[:depth], {})
+            names[parts[depth]] = None
+    return {folder: list(names) for folder, names in children.items()}
+
+
+def dataPrefix(names):
+    """
+    Finds the Pulse 'data' folder inside an archive, e.g. 'pulse-master/data' in a GitHub download.
+
+    Args:
+    - names (iterable of str): The member names of the archive.
+
+    Returns:
+    - prefix (tuple): The path parts of the 'data' folder.
+    """
+    for name in names:
+        parts = name.split('/')
+        for i in range(len(parts) - 1):
+            if parts[i] == 'data' and parts[i + 1] in pulseDataFolders:
+                return tuple(parts[:i + 1])
+    raise FileNotFoundError("No Pulse 'data' folder found in the archive")
+
+
+class DirectorySource:
+    """
+    Reads the Pulse data from the 'data' folder of an unpacked Pulse repository.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def listDir(self, parts):
+        """
+        Lists the names in a folder, given by its path parts relative to the Pulse 'data' folder, sorted so that
+        the work units are always merged in the same order, whatever order the file system lists them in.
+        """
+        return sorted(os.listdir(os.path.join(self.root, *parts)))
+
+    def readBytes(self, parts):
+        """
+        Reads the content of a file, given by its path parts relative to the Pulse 'data' folder.
+        """
+        with open(os.path.join(self.root, *parts), 'rb') as fileHandle:
+            return fileHandle.read()
+
+    def fingerprint(self, parts, previous=None):
+        """
+        Computes the fingerprint of a file for the manifest, from its size and mtime on disk.
+        """
+        fileStat = os.stat(os.path.join(self.root, *parts))
+        return contentFingerprint(fileStat.st_size, fileStat.st_mtime_ns, lambda: self.readBytes(parts), previous)
+
+
+class ArchiveSource:
+    """
+    Reads the Pulse data straight from a zip or tar archive of the Pulse repository (e.g. 'pulse-master.zip'),
+    without unpacking it. Zip archives and uncompressed tarballs are read in any order; a compressed tarball
+    is decompressed again from its start whenever a file is read before the previous one.
+    """
+
+    def __init__(self, path, prefix=None):
+        self.path = path
+        self.prefix = prefix
+
+    def opened(self):
+        """
+        Returns the archive handle, the member of each file, the tree index and a lock opened by this process.
+        """
+        key = (os.getpid(), 'archive', self.path)
+        if key not in openedSources:
+            if zipfile.is_zipfile(self.path):
+                handle = zipfile.ZipFile(self.path)
+                members = {member.filename: member for member in handle.infolist() if not member.is_dir()}
+            else:
+                handle = tarfile.open(self.path)
+                members = {member.name: member for member in handle.getmembers() if member.isfile()}
+
+            prefix = tuple(self.prefix.strip('/').split('/')) if self.prefix else dataPrefix(members)
+            dataMembers = {}
+            for name, member in members.items():
+                parts = tuple(name.split('/'))
+                if parts[:len(prefix)] == prefix:
+                    dataMembers[parts[len(prefix):]] = member
+            openedSources[key] = (handle, dataMembers, treeIndex(dataMembers), threading.Lock())
+        return openedSources[key]
+
+    def listDir(self, parts):
+        """
+        Lists the names in a folder, given by its path parts relative to the Pulse 'data' folder.
+        """
+        children = self.opened()[2]
+        if tuple(parts) not in children:
+            raise FileNotFoundError(f"{'/'.join(parts)} not found in {self.path}")
+        return list(children[tuple(parts)])
+
+    def readBytes(self, parts):
+        """
+        Reads the content of a file, given by its path parts relative to the Pulse 'data' folder.
+        """
+        handle, members, children, lock = self.opened()
+        member = members[tuple(parts)]
+        with lock:
+            if isinstance(handle, zipfile.ZipFile):
+                return handle.read(member)
+            return handle.extractfile(member).read()
+
+    def fingerprint(self, parts, previous=None):
+        """
+        Computes the fingerprint of a file for the manifest, from the size and mtime recorded in the archive.
+        """
+        member = self.opened()[1][tuple(parts)]
+        if isinstance(member, zipfile.ZipInfo):
+            size, mtime = member.file_size, '%04d-%02d-%02d %02d:%02d:%02d' % member.date_time
+        else:
+            size, mtime = member.size, member.mtime
+        return contentFingerprint(size, mtime, lambda: self.readBytes(parts), previous)
+
+
+class GitSource:
+    """
+    Reads the Pulse data straight from the objects of a local clone of the Pulse repository, at a given commit,
+    without checking it out. The git command line is used to list the tree and read the blobs.
+    """
+
+    def __init__(self, repository, commit='HEAD', dataPath='data'):
+        self.repository = repository
+        self.dataPath = dataPath.strip('/')
+
+        # Resolve the commit once, so that every worker reads the same tree even if the branch moves
+        self.commit = subprocess.run(
+            ['git', '-C', repository, 'rev-parse', '--verify', f"{commit}^{{commit}}"],
+            check = True, capture_output = True, text = True
+        ).stdout.strip()
+
+    def opened(self):
+        """
+        Returns the blob id and size of each file, the tree index, a 'git cat-file' process and a lock opened
+        by this process.
+        """
+        key = (os.getpid(), 'git', self.repository, self.commit)
+        if key not in openedSources:
+            listing = subprocess.run(
+                ['git', '-C', self.repository, 'ls-tree', '-r', '-l', '-z', self.commit, '--', self.dataPath],
+                check = True, capture_output = True
+            ).stdout.decode()
+
+            blobs = {}
+            prefixLength = len([part for part in self.dataPath.split('/') if part])
+            for entry in filter(None, listing.split('\0')):
+                header, path = entry.split('\t', 1)
+                mode, objectType, blobId, size = header.split()
+                if objectType == 'blob':
+                    blobs[tuple(path.split('/'))[prefixLength:]] = (blobId, int(size))
+
+            reader = subprocess.Popen(
+                ['git', '-C', self.repository, 'cat-file', '--batch'],
+                stdin = subprocess.PIPE, stdout = subprocess.PIPE
+            )
+            openedSources[key] = (blobs, treeIndex(blobs), reader, threading.Lock())
+        return openedSources[key]
+
+    def listDir(self, parts):
+        """
+        Lists the names in a folder, given by its path parts relative to the Pulse 'data' folder.
+        """
+        children = self.opened()[1]
+        if tuple(parts) not in children:
+            raise FileNotFoundError(f"{'/'.join(parts)} not found in {self.repository} at {self.commit}")
+        return list(children[tuple(parts)])
+
+    def readBytes(self, parts):
+        """
+        Reads the content of a file, given by its path parts relative to the Pulse 'data' folder.
+        """
+        blobs, children, reader, lock = self.opened()
+        blobId = blobs[tuple(parts)][0]
+        with lock:
+            reader.stdin.write(blobId.encode() + b'\n')
+            reader.stdin.flush()
+            size = int(reader.stdout.readline().split()[2])
+            content = reader.stdout.read(size)
+            reader.stdout.read(1)
+        return content
+
+    def fingerprint(self, parts, previous=None):
+        """
+        Computes the fingerprint of a file for the manifest. The blob id, which only changes with the content,
+        stands in for the mtime.
+        """
+        blobId, size = self.opened()[0][tuple(parts)]
+        return contentFingerprint(size, blobId, lambda: self.readBytes(parts), previous)
+
+
+def openSource(location, commit=None):
+    """
+    Returns the source of the Pulse data at a location.
+
+    Args:
+    - location (str or source): The Pulse 'data' folder, a zip or tar archive of the Pulse repository, or
+      a local clone of it when a commit is given. A source is returned as is.
+    - commit (str): The commit to read from a local clone. Defaults to reading the location as a folder or archive.
+
+    Returns:
+    - source (DirectorySource, ArchiveSource or GitSource): The source.
+    """
+    if not isinstance(location, str):
+        return location
+    if commit is not None:
+        return GitSource(location, commit)
+    if os.path.isdir(location):
+        return DirectorySource(location)
+    return ArchiveSource(location)
@@ -0,0 +1,91 @@
+# Importing required libraries
+import os
+import sys
+import tempfile
+import unittest
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Phonepe_Pulse_DataExtraction import datasetSpecs, extractDatasets, typedDataset
+from Phonepe_Pulse_Cube import AggregateCube
+from Phonepe_Pulse_Benchmark import generatePulseTree
+
+
+# ___*___*___*___*___*___ Aggregate Cube Tests ___*___*___*___*___*___ #
+
+class AggregateCubeTest(unittest.TestCase):
+    """
+    Compares the slices of the aggregate cube with a pandas group-by over the same rows of a synthetic Pulse tree.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        with tempfile.TemporaryDirectory() as workFolder:
+            dataRoot = os.path.join(workFolder, 'data')
+            generatePulseTree(dataRoot, stateCount = 3, yearCount = 2, districtCount = 2, pincodeCount = 2)
+            frames = extractDatasets(dataRoot, ['aggTrans', 'aggUser'], mode = 'serial')
+        dfTrans = typedDataset(datasetSpecs['aggTrans'], frames['aggTrans']).astype({'State': str, 'Transaction_Type': str})
+        dfUser = typedDataset(datasetSpecs['aggUser'], frames['aggUser']).astype({'State': str})
+
+        # Leave holes in the cube: a state without transactions in a quarter, and a transaction type missing from another
+        states = sorted(dfTrans['State'].unique())
+        dfTrans = dfTrans[~((dfTrans['State'] == states[0]) & (dfTrans['Year'] == 2019) & (dfTrans['Quarter'] == 2))]
+        dfTrans = dfTrans[~((dfTrans['State'] == states[1]) & (dfTrans['Year'] == 2018) & (dfTrans['Transaction_Type'] == 'Others'))]
+
+        cls.states, cls.dfTrans, cls.dfUser = states, dfTrans, dfUser
+        cls.cube = AggregateCube(
+            list(dfTrans.itertuples(index = False, name = None)),
+            list(dfUser[['State', 'Year', 'Quarter', 'User_Count', 'User_Percentage']].itertuples(index = False, name = None))
+        )
+
+    def quarterRows(self, df, Year, Quarter, State):
+        rows = df[(df['Year'] == Year) & (df['Quarter'] == Quarter)]
+        return rows if State == 'All' else rows[rows['State'] == State]
+
+    def quarters(self):
+        for Year in (2018, 2019):
+            for Quarter in (1, 2, 3, 4):
+                for State in ['All'] + self.states:
+                    yield Year, Quarter, State
+
+    def test_transaction_types(self):
+        for Year, Quarter, State in self.quarters():
+            expected = (self.quarterRows(self.dfTrans, Year, Quarter, State).groupby('Transaction_Type')['Transaction_Amount'].sum()
+                        .sort_values(ascending = False, kind = 'stable'))
+            df = self.cube.transactionTypes(Year, Quarter, State)
+            self.assertEqual(df['Transaction Type'].tolist(), expected.index.tolist(), (Year, Quarter, State))
+            pd.testing.assert_series_equal(df['Transaction Amount'], expected.reset_index(drop = True),
+                                           check_dtype = False, check_names = False, obj = f"{Year} Q{Quarter} {State}")
+
+    def test_registered_users(self):
+        for Year, Quarter, State in self.quarters():
+            expected = int(self.quarterRows(self.dfUser, Year, Quarter, State)['User_Count'].sum())
+            self.assertEqual(self.cube.registeredUsers(Year, Quarter, State), expected, (Year, Quarter, State))
+
+    def test_transaction_map(self):
+        for Year, Quarter, State in self.quarters():
+            expected = self.quarterRows(self.dfTrans, Year, Quarter, State).groupby('State').agg(
+                Avg_transaction_amount = ('Transaction_Amount', 'mean'),
+                Total_transaction_amount = ('Transaction_Amount', 'sum'),
+                Total_transaction_count = ('Transaction_Count', 'sum'),
+            ).reset_index()
+            df = self.cube.stateMap('Transactions', Year, Quarter, State)
+            pd.testing.assert_frame_equal(df, expected, check_dtype = False, obj = f"{Year} Q{Quarter} {State}")
+
+    def test_user_map(self):
+        for Year, Quarter, State in self.quarters():
+            expected = self.quarterRows(self.dfUser, Year, Quarter, State).groupby('State').agg(
+                **{'User Count': ('User_Count', 'sum'), 'User Percentage': ('User_Percentage', 'sum')}
+            ).reset_index()
+            df = self.cube.stateMap('Users', Year, Quarter, State)
+            pd.testing.assert_frame_equal(df, expected, check_dtype = False, rtol = 1e-6, obj = f"{Year} Q{Quarter} {State}")
+
+    def test_unknown_state_or_year_is_empty(self):
+        self.assertEqual(len(self.cube.transactionTypes(2018, 1, 'Atlantis')), 0)
+        self.assertEqual(len(self.cube.stateMap('Transactions', 2030, 1, 'All')), 0)
+        self.assertEqual(self.cube.registeredUsers(2030, 1, 'All'), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
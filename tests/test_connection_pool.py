@@ -0,0 +1,101 @@
+# Importing required libraries
+import os
+import sys
+import time
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Phonepe_Pulse_Database as pulseDatabase
+
+
+# ___*___*___*___*___*___ Connection Pool Tests ___*___*___*___*___*___ #
+
+class ConnectionPoolTest(unittest.TestCase):
+    """
+    Checks connections out of a pool of SQLite connections.
+    """
+
+    def setUp(self):
+        self.workFolder = tempfile.TemporaryDirectory()
+        pulseDatabase.configureDatabase('sqlite:///' + os.path.join(self.workFolder.name, 'PhonePe_Pulse.db'))
+
+    def tearDown(self):
+        self.workFolder.cleanup()
+
+    def test_returned_connection_is_reused(self):
+        pool = pulseDatabase.ConnectionPool(size = 2)
+        pooled = pool.connection()
+        connection = pooled.connection
+        pooled.close()
+
+        pooled = pool.connection()
+        self.assertIs(pooled.connection, connection)
+        self.assertEqual(pool.opened, 1)
+        pooled.close()
+
+    def test_closed_connection_cannot_be_used(self):
+        pool = pulseDatabase.ConnectionPool(size = 1)
+        pooled = pool.connection()
+        pooled.close()
+        pooled.close()
+        with self.assertRaises(RuntimeError):
+            pooled.cursor()
+        self.assertEqual(pool.idle.qsize(), 1)
+
+    def test_checkout_times_out_when_every_connection_is_in_use(self):
+        pool = pulseDatabase.ConnectionPool(size = 1, timeout = 0.2)
+        pooled = pool.connection()
+        startTime = time.monotonic()
+        with self.assertRaises(TimeoutError):
+            pool.connection()
+        self.assertGreaterEqual(time.monotonic() - startTime, 0.2)
+        self.assertEqual(pool.opened, 1)
+        pooled.close()
+
+    def test_checkout_waits_for_a_returned_connection(self):
+        pool = pulseDatabase.ConnectionPool(size = 1, timeout = 5)
+        pooled = pool.connection()
+        connection = pooled.connection
+        threading.Timer(0.1, pooled.close).start()
+
+        waited = pool.connection()
+        self.assertIs(waited.connection, connection)
+        waited.close()
+
+    def test_broken_idle_connection_is_replaced(self):
+        pool = pulseDatabase.ConnectionPool(size = 1, pingInterval = 0)
+        pooled = pool.connection()
+        connection = pooled.connection
+        pooled.close()
+        connection.close()
+
+        pooled = pool.connection()
+        self.assertIsNot(pooled.connection, connection)
+        self.assertEqual(pooled.cursor().execute("SELECT 1").fetchall(), [(1,)])
+        self.assertEqual(pool.opened, 1)
+        pooled.close()
+
+    def test_connections_are_shared_between_threads(self):
+        pool = pulseDatabase.ConnectionPool(size = 2, timeout = 5)
+        results = []
+
+        def query():
+            for attempt in range(20):
+                pooled = pool.connection()
+                results.append(pooled.cursor().execute("SELECT 1").fetchone()[0])
+                pooled.close()
+
+        threads = [threading.Thread(target = query) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [1] * 80)
+        self.assertLessEqual(pool.opened, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+# Importing required libraries
+import os
+import sys
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Phonepe_Pulse_GeoJson as pulseGeoJson
+
+
+# ___*___*___*___*___*___ State Map Cache Tests ___*___*___*___*___*___ #
+
+def writeStates(path, names, mtime):
+    """
+    Writes a GeoJSON of square states with the given names, and sets its mtime.
+    """
+    square = [[0, 0], [0, 1], [1, 1], [1, 0], [0, 0]]
+    features = [{'type': 'Feature', 'properties': {'ST_NM': name}, 'geometry': {'type': 'Polygon', 'coordinates': [square]}} for name in names]
+    with open(path, 'w') as fileHandle:
+        json.dump({'type': 'FeatureCollection', 'features': features}, fileHandle)
+    os.utime(path, ns = (mtime, mtime))
+
+
+def stateNames(geoJson):
+    return [feature['properties']['ST_NM'] for feature in geoJson['features']]
+
+
+class StateMapCacheTest(unittest.TestCase):
+    """
+    Loads the simplified states GeoJSON from a cache folder, without any network access.
+    """
+
+    def setUp(self):
+        self.workFolder = tempfile.TemporaryDirectory()
+        self.cacheFolder = os.path.join(self.workFolder.name, 'cache')
+        self.bundledPath = os.path.join(self.workFolder.name, 'india_states.geojson')
+        self.downloadPath = os.path.join(self.cacheFolder, 'india_states.download.geojson')
+        os.makedirs(self.cacheFolder)
+        writeStates(self.downloadPath, ['Downloaded'], 10 ** 18)
+
+    def tearDown(self):
+        self.workFolder.cleanup()
+
+    def load(self):
+        with mock.patch.object(pulseGeoJson, 'bundledGeoJsonPath', self.bundledPath):
+            return stateNames(pulseGeoJson.loadStatesGeoJson(folder = self.cacheFolder))
+
+    def test_updated_source_is_simplified_again(self):
+        writeStates(self.bundledPath, ['Goa'], 10 ** 18)
+        self.assertEqual(self.load(), ['Goa'])
+        self.assertEqual(self.load(), ['Goa'])
+
+        writeStates(self.bundledPath, ['Goa', 'Kerala'], 2 * 10 ** 18)
+        self.assertEqual(self.load(), ['Goa', 'Kerala'])
+
+    def test_switching_source_is_simplified_again(self):
+        writeStates(self.bundledPath, ['Goa'], 10 ** 18)
+        self.assertEqual(self.load(), ['Goa'])
+
+        # Without the bundled copy, the download already in the cache folder is used
+        os.remove(self.bundledPath)
+        self.assertEqual(self.load(), ['Downloaded'])
+
+
+if __name__ == '__main__':
+    unittest.main()
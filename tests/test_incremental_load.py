@@ -0,0 +1,71 @@
+# Importing required libraries
+import os
+import sys
+import sqlite3
+import tempfile
+import unittest
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Phonepe_Pulse_DataExtraction import main
+from Phonepe_Pulse_Benchmark import generatePulseTree
+
+
+# ___*___*___*___*___*___ Incremental Load Tests ___*___*___*___*___*___ #
+
+def databaseRows(path):
+    """
+    Reads every table of a SQLite database but 'lastrefreshed', whose date and refresh id change with every load.
+
+    Args:
+    - path (str): The database file.
+
+    Returns:
+    - tables (dict): The sorted rows of each table, keyed by table name.
+    """
+    with contextlib.closing(sqlite3.connect(path)) as connection:
+        tables = [row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name != 'lastrefreshed'")]
+        return {table: sorted(connection.execute(f"SELECT * FROM {table}").fetchall(), key = repr) for table in tables}
+
+
+class IncrementalLoadTest(unittest.TestCase):
+    """
+    Loads a synthetic Pulse tree incrementally, changes it and loads it again, then compares the database with
+    a full load of the changed tree.
+    """
+
+    def setUp(self):
+        self.workFolder = tempfile.TemporaryDirectory()
+        self.dataRoot = os.path.join(self.workFolder.name, 'data')
+
+    def tearDown(self):
+        self.workFolder.cleanup()
+
+    def runPipeline(self, name, *options):
+        outputFolder = os.path.join(self.workFolder.name, name)
+        os.makedirs(outputFolder, exist_ok = True)
+        databasePath = os.path.join(outputFolder, 'PhonePe_Pulse.db')
+        main([
+            'run', '--mode', 'serial', '--workers', '1', '--data-root', self.dataRoot, '--output-dir', outputFolder,
+            '--db-url', 'sqlite:///' + databasePath, *options
+        ])
+        return databasePath
+
+    def test_incremental_load_matches_full_load(self):
+        generatePulseTree(self.dataRoot, stateCount = 2, yearCount = 1, districtCount = 3, pincodeCount = 2)
+        self.runPipeline('incremental', '--incremental')
+
+        # Another seed changes the values of every file, and another year adds new files
+        generatePulseTree(self.dataRoot, stateCount = 2, yearCount = 2, districtCount = 3, pincodeCount = 2, seed = 1)
+        incrementalRows = databaseRows(self.runPipeline('incremental', '--incremental'))
+        fullRows = databaseRows(self.runPipeline('full'))
+
+        self.assertEqual(sorted(incrementalRows), sorted(fullRows))
+        for table, rows in fullRows.items():
+            self.assertEqual(incrementalRows[table], rows, table)
+        self.assertTrue(any(rows for rows in fullRows.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+# Importing required libraries
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Phonepe_Pulse_DataExtraction import main, datasetSpecs, loadManifest, incrementalSelection, manifestFileName
+from Phonepe_Pulse_Benchmark import generatePulseTree
+
+
+# ___*___*___*___*___*___ Incremental Manifest Tests ___*___*___*___*___*___ #
+
+class IncrementalManifestTest(unittest.TestCase):
+    """
+    Runs the incremental pipeline on a small synthetic Pulse tree, loaded into a SQLite database.
+    """
+
+    def setUp(self):
+        self.workFolder = tempfile.TemporaryDirectory()
+        self.dataRoot = os.path.join(self.workFolder.name, 'data')
+        self.outputFolder = os.path.join(self.workFolder.name, 'out')
+        os.makedirs(self.outputFolder)
+        generatePulseTree(self.dataRoot, stateCount = 2, yearCount = 1, districtCount = 3, pincodeCount = 2)
+
+    def tearDown(self):
+        self.workFolder.cleanup()
+
+    def runIncremental(self, *options):
+        main([
+            'run', '--incremental', '--mode', 'serial', '--workers', '1',
+            '--data-root', self.dataRoot, '--output-dir', self.outputFolder,
+            '--db-url', 'sqlite:///' + os.path.join(self.workFolder.name, 'PhonePe_Pulse.db'), *options
+        ])
+        return loadManifest(os.path.join(self.outputFolder, manifestFileName))
+
+    def test_dataset_subset_keeps_other_entries(self):
+        fullManifest = self.runIncremental()
+        self.assertTrue(fullManifest)
+
+        subsetManifest = self.runIncremental('--datasets', 'aggTrans')
+        self.assertEqual(subsetManifest, fullManifest)
+
+        # Nothing changed, so the next full run has no file to extract again
+        selection, updatedManifest = incrementalSelection(self.dataRoot, list(datasetSpecs), subsetManifest)
+        self.assertEqual(selection, {})
+
+    def test_shared_files_stay_pending_for_unselected_datasets(self):
+        self.runIncremental()
+
+        # topTrans and topDistrictTrans read the same files: change one, then only run topTrans
+        source = datasetSpecs['topTrans']['source']
+        state = sorted(os.listdir(os.path.join(self.dataRoot, *source)))[0]
+        changedFile = os.path.join(self.dataRoot, *source, state, '2018', '1.json')
+        with open(changedFile, 'a') as fileHandle:
+            fileHandle.write('\n')
+        manifest = self.runIncremental('--datasets', 'topTrans')
+
+        selection, updatedManifest = incrementalSelection(self.dataRoot, ['topDistrictTrans'], manifest)
+        self.assertEqual(selection, {'topDistrictTrans': {state: [('2018', '1.json')]}})
+
+
+if __name__ == '__main__':
+    unittest.main()
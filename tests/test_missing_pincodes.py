@@ -0,0 +1,70 @@
+# Importing required libraries
+import os
+import sys
+import sqlite3
+import tempfile
+import unittest
+import contextlib
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Phonepe_Pulse_Database as pulseDatabase
+from Phonepe_Pulse_DataExtraction import datasetSpecs, typedDataset, buildWideTable
+
+
+# ___*___*___*___*___*___ Missing Pincode Tests ___*___*___*___*___*___ #
+
+def topFrame(datasetName, pincodes, values):
+    """
+    Builds the typed rows of a top dataset for one (State, Year, Quarter), one row per pincode and value.
+    """
+    metrics = [column for column in datasetSpecs[datasetName]['fields'] if column != 'Pincode']
+    df = pd.DataFrame({
+        'State': 'Goa', 'Year': '2018', 'Quarter': '1', 'Pincode': pincodes,
+        **{column: values for column in metrics},
+    })
+    return typedDataset(datasetSpecs[datasetName], df)
+
+
+class MissingPincodeTest(unittest.TestCase):
+    """
+    Loads top pincode rows whose pincode is missing, as found in some of the Pulse top lists.
+    """
+
+    def setUp(self):
+        self.workFolder = tempfile.TemporaryDirectory()
+        pulseDatabase.configureDatabase('sqlite:///' + os.path.join(self.workFolder.name, 'PhonePe_Pulse.db'))
+        self.topTrans = topFrame('topTrans', [403001, None, None], [30, 20, 10])
+        self.topUser = topFrame('topUser', [403001, None], [300, 200])
+
+    def tearDown(self):
+        self.workFolder.cleanup()
+
+    def rows(self, query):
+        with contextlib.closing(sqlite3.connect(pulseDatabase.sqliteDatabasePath(pulseDatabase.databaseName))) as connection:
+            return connection.execute(query).fetchall()
+
+    def test_rows_without_pincode_are_loaded(self):
+        wide = buildWideTable('factPincode', {'topTrans': self.topTrans, 'topUser': self.topUser})
+        with contextlib.closing(pulseDatabase.connectToServer()) as connection:
+            pulseDatabase.fullLoad(connection, [
+                ('TopTrans', self.topTrans), ('TopUser', self.topUser), ('FactPincodeQuarter', wide),
+            ], keep = 0)
+
+        self.assertCountEqual(self.rows("SELECT Pincode, Transaction_Count FROM TopTrans"), [(None, 10), (None, 20), (403001, 30)])
+        self.assertCountEqual(self.rows("SELECT Pincode, Registered_User FROM TopUser"), [(None, 200), (403001, 300)])
+        self.assertCountEqual(self.rows("SELECT Pincode, Transaction_Count FROM RollupPincodeYearTrans"), [(None, 30), (403001, 30)])
+        self.assertCountEqual(
+            self.rows("SELECT Pincode, Transaction_Count, Registered_User FROM FactPincodeQuarter"),
+            [(None, 10, None), (None, 20, None), (None, None, 200), (403001, 30, 300)]
+        )
+
+    def test_duplicated_pincodes_keep_the_first_row(self):
+        df = pulseDatabase.prepareFrame('TopTrans', topFrame('topTrans', [403001, 403001, None, None], [30, 20, 10, 5]))
+        self.assertEqual(df['Transaction_Count'].tolist(), [30, 10, 5])
+        self.assertEqual(int(df['Pincode'].isna().sum()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+# Importing required libraries
+import os
+import sys
+import unittest
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Phonepe_Pulse_Database as pulseDatabase
+
+
+# ___*___*___*___*___*___ MySQL Transaction Tests ___*___*___*___*___*___ #
+
+class FakeMySqlCursor:
+    """
+    A cursor of FakeMySqlConnection, answering the catalog queries of the loader.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.description = None
+        self.rows = []
+
+    def execute(self, statement, parameters=None):
+        self.connection.run(statement)
+        self.description = None
+        self.rows = []
+        if 'information_schema.SCHEMATA' in statement:
+            self.rows = [parameters] if parameters[0] in self.connection.databases else []
+        elif statement.startswith('SHOW TABLES'):
+            self.rows = [(table,) for table in self.connection.tables]
+        elif 'FROM lastrefreshed' in statement and statement.startswith('SELECT'):
+            self.description = [('date',), ('refresh_id',)]
+
+    def executemany(self, statement, values):
+        self.connection.run(statement)
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+class FakeMySqlConnection:
+    """
+    Mimics the transactions of a MySQL connection with autocommit off: a statement reading or writing a table
+    starts a transaction implicitly, a DDL statement commits implicitly, and starting a transaction while one
+    is in progress fails, as with mysql.connector.
+    """
+
+    def __init__(self, databases=(), tables=()):
+        self.databases = set(databases)
+        self.tables = list(tables)
+        self.inTransaction = False
+
+    def run(self, statement):
+        verb = statement.split()[0].upper()
+        if verb in ('CREATE', 'ALTER', 'DROP', 'RENAME', 'TRUNCATE'):
+            self.inTransaction = False
+        elif verb in ('SELECT', 'SHOW', 'INSERT', 'DELETE', 'UPDATE'):
+            self.inTransaction = True
+
+    def cursor(self):
+        return FakeMySqlCursor(self)
+
+    def start_transaction(self):
+        if self.inTransaction:
+            raise RuntimeError("Transaction already in progress")
+        self.inTransaction = True
+
+    def commit(self):
+        self.inTransaction = False
+
+    def rollback(self):
+        self.inTransaction = False
+
+
+class MySqlTransactionTest(unittest.TestCase):
+    """
+    Runs the MySQL loads against a connection with the transaction semantics of MySQL.
+    """
+
+    def setUp(self):
+        self.backend = pulseDatabase.databaseBackend
+        pulseDatabase.databaseBackend = 'mysql'
+
+    def tearDown(self):
+        pulseDatabase.databaseBackend = self.backend
+
+    def aggTrans(self):
+        df = pd.DataFrame({
+            'State': ['Goa'], 'Year': [2022], 'Quarter': [1], 'Transaction_Type': ['Others'],
+            'Transaction_Count': [1], 'Transaction_Amount': [1.0],
+        })
+        return df, df[['State', 'Year', 'Quarter']]
+
+    def test_incremental_load(self):
+        tables = list(pulseDatabase.tableSchemas) + list(pulseDatabase.rollupSchemas) + ['lastrefreshed']
+        connection = FakeMySqlConnection([pulseDatabase.databaseName], tables)
+        rowCounts = pulseDatabase.incrementalLoad(connection, {'AggTrans': self.aggTrans()})
+        self.assertEqual(rowCounts, {'AggTrans': 1})
+        self.assertFalse(connection.inTransaction)
+
+    def test_full_load(self):
+        connection = FakeMySqlConnection([pulseDatabase.databaseName])
+        loadStats = pulseDatabase.fullLoad(connection, [('AggTrans', self.aggTrans()[0])])
+        self.assertEqual([stats['rows'] for stats in loadStats], [1])
+
+    def test_rebuild_rollups(self):
+        connection = FakeMySqlConnection([pulseDatabase.databaseName])
+        self.assertTrue(pulseDatabase.rebuildRollups(connection, ['AggTrans']))
+        self.assertFalse(connection.inTransaction)
+
+
+if __name__ == '__main__':
+    unittest.main()
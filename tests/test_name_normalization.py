@@ -0,0 +1,46 @@
+# Importing required libraries
+import os
+import sys
+import unittest
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Phonepe_Pulse_DataExtraction import datasetSpecs, stateName, districtName, cleanDataset
+
+
+# ___*___*___*___*___*___ Name Normalization Tests ___*___*___*___*___*___ #
+
+class NameNormalizationTest(unittest.TestCase):
+    """
+    Normalizes state and district names as found in the Pulse data.
+    """
+
+    def test_district_suffix_is_removed(self):
+        self.assertEqual(districtName('north goa district'), 'North Goa')
+        self.assertEqual(districtName('east district'), 'East')
+        self.assertEqual(districtName('south west delhi district'), 'South West Delhi')
+
+    def test_names_without_suffix_keep_their_letters(self):
+        # Every one of these ends with letters of 'district'
+        for rawName, name in (('hyderabad', 'Hyderabad'), ('jaipur', 'Jaipur'), ('chennai', 'Chennai'), ('surat', 'Surat'),
+                              ('east', 'East'), ('bengaluru urban', 'Bengaluru Urban')):
+            self.assertEqual(districtName(rawName), name)
+
+    def test_state_names(self):
+        self.assertEqual(stateName('andaman-&-nicobar-islands'), 'Andaman & Nicobar Island')
+        self.assertEqual(stateName('tamil-nadu'), 'Tamil Nadu')
+
+    def test_dataset_district_column(self):
+        df = pd.DataFrame({
+            'State': ['telangana', 'delhi'], 'Year': '2022', 'Quarter': '1',
+            'District': ['hyderabad district', 'east district'],
+            'Transaction_Count': 1, 'Transaction_Amount': 1.0,
+        })
+        df = cleanDataset(datasetSpecs['mapTrans'], df)
+        self.assertEqual(df['State'].tolist(), ['Telangana', 'Delhi'])
+        self.assertEqual(df['District'].tolist(), ['Hyderabad', 'East'])
+
+
+if __name__ == '__main__':
+    unittest.main()
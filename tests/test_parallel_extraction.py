@@ -0,0 +1,56 @@
+# Importing required libraries
+import os
+import sys
+import tempfile
+import unittest
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Phonepe_Pulse_DataExtraction import datasetSpecs, extractDatasets
+from Phonepe_Pulse_Sources import DirectorySource
+from Phonepe_Pulse_Benchmark import generatePulseTree
+
+
+# ___*___*___*___*___*___ Parallel Extraction Tests ___*___*___*___*___*___ #
+
+class ParallelExtractionTest(unittest.TestCase):
+    """
+    Extracts a small synthetic Pulse tree serially and across thread and process pools.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.workFolder = tempfile.TemporaryDirectory()
+        cls.dataRoot = os.path.join(cls.workFolder.name, 'data')
+        generatePulseTree(cls.dataRoot, stateCount = 4, yearCount = 2, districtCount = 3, pincodeCount = 2)
+        cls.serialFrames = extractDatasets(cls.dataRoot, mode = 'serial')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.workFolder.cleanup()
+
+    def assertSameFrames(self, frames):
+        self.assertEqual(list(frames), list(self.serialFrames))
+        for datasetName, df in frames.items():
+            pd.testing.assert_frame_equal(df, self.serialFrames[datasetName], obj = datasetName)
+
+    def test_serial_extraction_reads_every_dataset(self):
+        self.assertEqual(list(self.serialFrames), list(datasetSpecs))
+        for datasetName, df in self.serialFrames.items():
+            self.assertGreater(len(df), 0, datasetName)
+
+    def test_thread_pool_matches_serial(self):
+        self.assertSameFrames(extractDatasets(self.dataRoot, workers = 4, mode = 'thread'))
+
+    def test_process_pool_matches_serial(self):
+        self.assertSameFrames(extractDatasets(self.dataRoot, workers = 2, mode = 'process'))
+
+    def test_directory_listing_is_sorted(self):
+        source = DirectorySource(self.dataRoot)
+        states = source.listDir(datasetSpecs['aggTrans']['source'])
+        self.assertEqual(states, sorted(states))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+# Importing required libraries
+import os
+import sys
+import sqlite3
+import tempfile
+import unittest
+import contextlib
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Phonepe_Pulse_Database as pulseDatabase
+
+
+# ___*___*___*___*___*___ Shadow Refresh Tests ___*___*___*___*___*___ #
+
+def aggTransFrame(amount):
+    """
+    Builds the rows of a small AggTrans table, every amount set to the given one.
+    """
+    return pd.DataFrame({
+        'State': ['Goa', 'Goa', 'Kerala'],
+        'Year': [2018, 2018, 2018],
+        'Quarter': [1, 1, 1],
+        'Transaction_Type': ['Merchant payments', 'Others', 'Merchant payments'],
+        'Transaction_Count': [10, 20, 30],
+        'Transaction_Amount': [amount, amount, amount],
+    })
+
+
+class ShadowRefreshTest(unittest.TestCase):
+    """
+    Runs full refreshes of a SQLite database through its shadow database, and rolls them back.
+    """
+
+    def setUp(self):
+        self.workFolder = tempfile.TemporaryDirectory()
+        pulseDatabase.configureDatabase('sqlite:///' + os.path.join(self.workFolder.name, 'PhonePe_Pulse.db'))
+        self.connection = pulseDatabase.connectToServer()
+
+    def tearDown(self):
+        self.connection.close()
+        self.workFolder.cleanup()
+
+    def amounts(self, database):
+        with contextlib.closing(sqlite3.connect(pulseDatabase.sqliteDatabasePath(database))) as connection:
+            return {row[0] for row in connection.execute("SELECT Transaction_Amount FROM AggTrans")}
+
+    def refresh(self, amount, keep=None):
+        pulseDatabase.fullLoad(self.connection, [('AggTrans', aggTransFrame(amount))], keep = keep)
+
+    def test_swap_keeps_previous_generations(self):
+        for amount in (1.0, 2.0, 3.0):
+            self.refresh(amount, keep = 2)
+
+        self.assertEqual(self.amounts(pulseDatabase.databaseName), {3.0})
+        self.assertEqual(self.amounts(pulseDatabase.generationName(1)), {2.0})
+        self.assertEqual(self.amounts(pulseDatabase.generationName(2)), {1.0})
+        self.assertFalse(os.path.exists(pulseDatabase.sqliteDatabasePath(pulseDatabase.generationName(3))))
+        self.assertFalse(os.path.exists(pulseDatabase.sqliteDatabasePath(pulseDatabase.shadowName())))
+
+    def test_swap_builds_rollups_and_refresh_date(self):
+        self.refresh(1.0)
+        with contextlib.closing(sqlite3.connect(pulseDatabase.sqliteDatabasePath(pulseDatabase.databaseName))) as connection:
+            tables = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            refreshes = connection.execute("SELECT refresh_id FROM lastrefreshed").fetchall()
+        self.assertIn('lastrefreshed', tables)
+        self.assertTrue({rollup for rollup, schema in pulseDatabase.rollupSchemas.items() if schema['source'] == 'AggTrans'} <= tables)
+        self.assertEqual(len(refreshes), 1)
+
+    def test_rollback_swaps_previous_generation_back(self):
+        self.refresh(1.0)
+        self.refresh(2.0)
+
+        pulseDatabase.rollbackRefresh(self.connection)
+        self.assertEqual(self.amounts(pulseDatabase.databaseName), {1.0})
+        self.assertEqual(self.amounts(pulseDatabase.generationName(1)), {2.0})
+
+        # Rolling back again undoes the rollback
+        pulseDatabase.rollbackRefresh(self.connection)
+        self.assertEqual(self.amounts(pulseDatabase.databaseName), {2.0})
+        self.assertEqual(self.amounts(pulseDatabase.generationName(1)), {1.0})
+
+    def test_rollback_without_previous_generation_fails(self):
+        self.refresh(1.0, keep = 0)
+        with self.assertRaises(RuntimeError):
+            pulseDatabase.rollbackRefresh(self.connection)
+        self.assertEqual(self.amounts(pulseDatabase.databaseName), {1.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
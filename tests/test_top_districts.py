@@ -0,0 +1,101 @@
+# Importing required libraries
+import os
+import sys
+import json
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Phonepe_Pulse_DataExtraction import extractDatasets
+from Phonepe_Pulse_Metrics import RunMetrics
+
+
+# ___*___*___*___*___*___ Top District Tests ___*___*___*___*___*___ #
+
+# Names of the top district lists as found in the Pulse data, without the ' district' suffix of the map files
+stateDistricts = ['hyderabad', 'rangareddy', 'medchal malkajgiri']
+countryDistricts = ['jaipur', 'chennai', 'surat']
+
+topDatasets = ['topTrans', 'topDistrictTrans', 'topUser', 'topDistrictUser', 'countryTopDistrictTrans', 'countryTopDistrictUser']
+
+
+def writeJson(path, data):
+    """
+    Writes the data of a Pulse file.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok = True)
+    with open(path, 'w') as fileHandle:
+        json.dump({'success': True, 'data': data}, fileHandle)
+
+
+def topTransactionData(districts, pincodes):
+    return {
+        'districts': [{'entityName': name, 'metric': {'type': 'TOTAL', 'count': 10, 'amount': 100.0}} for name in districts],
+        'pincodes': [{'entityName': pincode, 'metric': {'type': 'TOTAL', 'count': 5, 'amount': 50.0}} for pincode in pincodes],
+    }
+
+
+def topUserData(districts, pincodes):
+    return {
+        'districts': [{'name': name, 'registeredUsers': 1000} for name in districts],
+        'pincodes': [{'name': pincode, 'registeredUsers': 500} for pincode in pincodes],
+    }
+
+
+class TopDistrictTest(unittest.TestCase):
+    """
+    Extracts the top district and pincode lists of a hand-written Pulse tree with real district names.
+    """
+
+    def setUp(self):
+        self.workFolder = tempfile.TemporaryDirectory()
+        self.dataRoot = os.path.join(self.workFolder.name, 'data')
+        for section, data in (('transaction', topTransactionData), ('user', topUserData)):
+            writeJson(os.path.join(self.dataRoot, 'top', section, 'country', 'india', 'state', 'telangana', '2022', '1.json'),
+                      data(stateDistricts, ['500001', '500002']))
+            writeJson(os.path.join(self.dataRoot, 'top', section, 'country', 'india', '2022', '1.json'),
+                      data(countryDistricts, ['302001']))
+
+    def tearDown(self):
+        self.workFolder.cleanup()
+
+    def test_top_district_names_keep_their_letters(self):
+        frames = extractDatasets(self.dataRoot, topDatasets, mode = 'serial')
+        for datasetName in ('topDistrictTrans', 'topDistrictUser'):
+            self.assertEqual(frames[datasetName]['District'].tolist(), ['Hyderabad', 'Rangareddy', 'Medchal Malkajgiri'])
+        for datasetName in ('countryTopDistrictTrans', 'countryTopDistrictUser'):
+            self.assertEqual(frames[datasetName]['District'].tolist(), ['Jaipur', 'Chennai', 'Surat'])
+
+    def test_shared_files_are_parsed_once(self):
+        metrics = RunMetrics(trace = False)
+        frames = extractDatasets(self.dataRoot, topDatasets, mode = 'serial', metrics = metrics)
+        self.assertEqual(frames['topTrans']['Pincode'].tolist(), ['500001', '500002'])
+        self.assertEqual(frames['topUser']['Pincode'].tolist(), ['500001', '500002'])
+
+        self.assertEqual(metrics.stages[('topTrans+topDistrictTrans', 'parse')]['calls'], 1)
+        self.assertEqual(metrics.stages[('topUser+topDistrictUser', 'parse')]['calls'], 1)
+        self.assertEqual(metrics.stages[('topTrans', 'flatten')]['calls'], 1)
+        self.assertEqual(metrics.stages[('topDistrictTrans', 'flatten')]['calls'], 1)
+
+    def test_flatten_error_only_skips_its_dataset(self):
+        # The pincodes of this file miss their metric, its districts are fine
+        data = topTransactionData(stateDistricts, ['500001'])
+        del data['pincodes'][0]['metric']
+        writeJson(os.path.join(self.dataRoot, 'top', 'transaction', 'country', 'india', 'state', 'telangana', '2022', '1.json'), data)
+
+        quarantine = []
+        frames = extractDatasets(self.dataRoot, ['topTrans', 'topDistrictTrans'], mode = 'serial', quarantine = quarantine)
+        self.assertEqual(len(frames['topTrans']), 0)
+        self.assertEqual(len(frames['topDistrictTrans']), 3)
+        self.assertEqual([entry['dataset'] for entry in quarantine], ['topTrans'])
+
+    def test_selection_only_flattens_the_selected_datasets(self):
+        selection = {'topDistrictTrans': {'telangana': [('2022', '1.json')]}}
+        frames = extractDatasets(self.dataRoot, ['topTrans', 'topDistrictTrans'], mode = 'serial', selection = selection)
+        self.assertEqual(len(frames['topTrans']), 0)
+        self.assertEqual(len(frames['topDistrictTrans']), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()